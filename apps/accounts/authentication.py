@@ -0,0 +1,61 @@
+"""
+Authentication backends for the API.
+"""
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from .models import User
+
+TOKEN_CACHE_TIMEOUT = 300  # 5 minutes
+
+# User columns kept in the cache; anything else (password hash included) is
+# deferred and loaded from the database only if a view reads it
+CACHED_USER_FIELDS = frozenset(
+    {"id", "is_active", "email", "username", "first_name", "last_name", "created_at"}
+)
+
+
+def token_cache_key(key):
+    """Cache key holding the user resolved for an auth token."""
+    return f"authtok:{key}"
+
+
+def _cached_user_attnames():
+    """Cached field names in model order, as Model.from_db expects them."""
+    return [
+        field.attname
+        for field in User._meta.concrete_fields
+        if field.attname in CACHED_USER_FIELDS
+    ]
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that caches the token -> user lookup."""
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        attnames = _cached_user_attnames()
+        values = cache.get(cache_key)
+
+        if values is None:
+            try:
+                token = Token.objects.select_related("user").get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            user = token.user
+            cache.set(
+                cache_key,
+                tuple(getattr(user, attname) for attname in attnames),
+                TOKEN_CACHE_TIMEOUT,
+            )
+        else:
+            user = User.from_db(DEFAULT_DB_ALIAS, attnames, values)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (user, key)
@@ -0,0 +1,13 @@
+"""
+Password hashers for the application.
+"""
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id hasher with OWASP-recommended parameters (~46 MiB, t=2, p=1)."""
+
+    time_cost = 2
+    memory_cost = 46 * 1024
+    parallelism = 1
@@ -0,0 +1,25 @@
+"""
+Invalidation of the cached token -> user lookup.
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .authentication import token_cache_key
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Profile, password and is_active edits must reach API requests at once;
+    # the last_login bump on every login changes nothing they read
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+        cache.delete(token_cache_key(key))
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    cache.delete(token_cache_key(instance.key))
@@ -0,0 +1,33 @@
+"""
+Celery tasks for account side-effects kept off the request path.
+"""
+
+import logging
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import send_mail
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def send_welcome_email(user_id):
+    """Send the welcome email to a newly registered user."""
+    try:
+        user = User.objects.only("email", "first_name").get(pk=user_id)
+    except User.DoesNotExist:
+        logger.warning(f"Welcome email skipped, user {user_id} not found")
+        return
+
+    send_mail(
+        subject="Welcome to AI Scriber",
+        message=(
+            f"Hi {user.first_name},\n\n"
+            "Your AI Scriber account is ready. "
+            "You can now upload audio files and get them transcribed."
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+    )
+    logger.info(f"Welcome email sent to user {user_id}")
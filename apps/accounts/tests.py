@@ -0,0 +1,140 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.urls import reverse
+from kombu.exceptions import OperationalError
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from .authentication import token_cache_key
+from .models import User
+from .views import _duplicate_user_error
+
+
+@pytest.mark.django_db
+def test_register_succeeds_when_broker_is_down(django_capture_on_commit_callbacks):
+    with (
+        mock.patch(
+            "apps.accounts.views.send_welcome_email.delay",
+            side_effect=OperationalError("broker unavailable"),
+        ) as delay,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        response = APIClient().post(
+            reverse("api_register"),
+            {
+                "email": "new@example.com",
+                "username": "newuser",
+                "first_name": "New",
+                "last_name": "User",
+                "password": "secret-pass-123",
+                "password_confirm": "secret-pass-123",
+            },
+            format="json",
+        )
+
+    assert response.status_code == 201
+    assert User.objects.filter(email="new@example.com").exists()
+    delay.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_deactivated_user_loses_cached_token_access():
+    user = User.objects.create_user(
+        username="member",
+        email="member@example.com",
+        first_name="Member",
+        last_name="User",
+        password="secret-pass-123",
+    )
+    token = Token.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    assert client.get(reverse("api_profile")).status_code == 200
+
+    user.is_active = False
+    user.save()
+
+    assert client.get(reverse("api_profile")).status_code == 401
+
+
+@pytest.mark.django_db
+def test_web_register_reports_duplicate_username_by_constraint(client):
+    User.objects.create_user(
+        username="my_email",
+        email="first@example.com",
+        first_name="First",
+        last_name="User",
+        password="secret-pass-123",
+    )
+
+    response = client.post(
+        reverse("register"),
+        {
+            "email": "second@example.com",
+            "username": "my_email",
+            "first_name": "Second",
+            "last_name": "User",
+            "password": "secret-pass-123",
+            "password_confirm": "secret-pass-123",
+        },
+    )
+
+    assert response.context["error"] == "Username already exists"
+
+
+def test_duplicate_user_error_uses_postgres_constraint_name():
+    cause = Exception(
+        'duplicate key value violates unique constraint "accounts_user_username_key"\n'
+        "DETAIL:  Key (username)=(my_email) already exists."
+    )
+    cause.diag = mock.Mock(constraint_name="accounts_user_username_key")
+    error = IntegrityError(str(cause))
+    error.__cause__ = cause
+
+    assert _duplicate_user_error(error) == "Username already exists"
+
+
+@pytest.mark.django_db
+def test_login_user_payload_matches_profile():
+    User.objects.create_user(
+        username="member",
+        email="member@example.com",
+        first_name="Member",
+        last_name="User",
+        password="secret-pass-123",
+    )
+    client = APIClient()
+    login_response = client.post(
+        reverse("api_login"),
+        {"email": "member@example.com", "password": "secret-pass-123"},
+        format="json",
+    )
+    client.credentials(HTTP_AUTHORIZATION=f"Token {login_response.json()['token']}")
+
+    profile_response = client.get(reverse("api_profile"))
+
+    assert login_response.json()["user"] == profile_response.json()
+
+
+@pytest.mark.django_db
+def test_token_cache_holds_no_password_hash():
+    user = User.objects.create_user(
+        username="member",
+        email="member@example.com",
+        first_name="Member",
+        last_name="User",
+        password="secret-pass-123",
+    )
+    token = Token.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    client.get(reverse("api_profile"))
+
+    cached = cache.get(token_cache_key(token.key))
+    assert user.password not in cached
+
+    # Served from the cache, the profile matches the database user
+    response = client.get(reverse("api_profile"))
+    assert response.json()["email"] == "member@example.com"
@@ -1,4 +1,7 @@
-from rest_framework import status
+import json
+import logging
+import mimetypes
+from rest_framework import serializers, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
@@ -8,9 +11,69 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_protect
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.urls import reverse
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from apps.transcription.models import AudioFile, Transcription
+from .tasks import send_welcome_email
 from .serializers import UserRegistrationSerializer, UserSerializer, LoginSerializer
 from .models import User
 
+logger = logging.getLogger(__name__)
+
+WORD_TIMESTAMPS_CACHE_TIMEOUT = 24 * 60 * 60  # 1 day
+
+# Formats created_at exactly as UserSerializer does
+_datetime_field = serializers.DateTimeField()
+
+
+def _ensure_token(user):
+    """Return the user's API token, creating it on first use.
+
+    Plain SELECT first: unlike get_or_create, the common (existing token)
+    case needs no savepoint.
+    """
+    token = Token.objects.filter(user=user).only("key").first()
+    if token is not None:
+        return token
+    try:
+        with transaction.atomic():
+            return Token.objects.create(user=user)
+    except IntegrityError:
+        # Created concurrently by another request
+        return Token.objects.only("key").get(user=user)
+
+
+def _queue_welcome_email(user_id):
+    """Queue the welcome email once the user is committed.
+
+    The email is best-effort: a broker outage is logged, never reported as a
+    failed registration.
+    """
+
+    def send():
+        try:
+            send_welcome_email.delay(user_id)
+        except Exception:
+            logger.exception(f"Could not queue welcome email for user {user_id}")
+
+    transaction.on_commit(send)
+
+
+def _user_payload(user):
+    """Same shape as UserSerializer(user).data, without serializer overhead."""
+    return {
+        "id": user.pk,
+        "email": user.email,
+        "username": user.username,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "created_at": _datetime_field.to_representation(user.created_at),
+    }
+
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
@@ -18,10 +81,12 @@ def register(request):
     """Register a new user."""
     serializer = UserRegistrationSerializer(data=request.data)
     if serializer.is_valid():
-        user = serializer.save()
-        token, created = Token.objects.get_or_create(user=user)
+        with transaction.atomic():
+            user = serializer.save()
+            token = _ensure_token(user)
+            _queue_welcome_email(user.pk)
         return Response(
-            {"user": UserSerializer(user).data, "token": token.key},
+            {"user": _user_payload(user), "token": token.key},
             status=status.HTTP_201_CREATED,
         )
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -35,8 +100,8 @@ def login_view(request):
     if serializer.is_valid():
         user = serializer.validated_data["user"]
         login(request, user)
-        token, created = Token.objects.get_or_create(user=user)
-        return Response({"user": UserSerializer(user).data, "token": token.key})
+        token = _ensure_token(user)
+        return Response({"user": _user_payload(user), "token": token.key})
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -76,7 +141,7 @@ def web_login(request):
         if user is not None:
             login(request, user)
             # Create or get token for API calls
-            token, created = Token.objects.get_or_create(user=user)
+            token = _ensure_token(user)
             # Store token in session for JavaScript access
             request.session["auth_token"] = token.key
             return redirect("dashboard")
@@ -90,6 +155,27 @@ def web_login(request):
     return render(request, "accounts/login.html")
 
 
+# Unique constraints on User by name: PostgreSQL's constraint name, or the
+# column SQLite reports ("UNIQUE constraint failed: accounts_user.email")
+DUPLICATE_USER_ERRORS = {
+    "accounts_user_email_key": "Email already exists",
+    "accounts_user_username_key": "Username already exists",
+    "accounts_user.email": "Email already exists",
+    "accounts_user.username": "Username already exists",
+}
+
+
+def _duplicate_user_error(error):
+    """Map a unique constraint violation on User to a form error message."""
+    cause = error.__cause__
+    diag = getattr(cause, "diag", None)
+    if diag is not None:
+        name = diag.constraint_name
+    else:
+        name = str(cause).rpartition(": ")[2]
+    return DUPLICATE_USER_ERRORS.get(name, "Registration failed. Please try again.")
+
+
 @csrf_protect
 def web_register(request):
     """Web registration page."""
@@ -118,45 +204,37 @@ def web_register(request):
                 },
             )
 
-        if User.objects.filter(email=email).exists():
-            return render(
-                request,
-                "accounts/register.html",
-                {
-                    "error": "Email already exists",
-                    "email": email,
-                    "username": username,
-                    "first_name": first_name,
-                    "last_name": last_name,
-                },
-            )
-
-        if User.objects.filter(username=username).exists():
+        try:
+            # User and token commit together, so a failure never leaves a
+            # user without an API token
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=username,
+                    email=email,
+                    first_name=first_name,
+                    last_name=last_name,
+                    password=password,
+                )
+                # Create token for API calls
+                token = _ensure_token(user)
+                _queue_welcome_email(user.pk)
+            login(request, user)
+            request.session["auth_token"] = token.key
+            return redirect("dashboard")
+        except IntegrityError as e:
+            # Unique constraints on email/username are the source of truth;
+            # the constraint name tells which one fired
             return render(
                 request,
                 "accounts/register.html",
                 {
-                    "error": "Username already exists",
+                    "error": _duplicate_user_error(e),
                     "email": email,
                     "username": username,
                     "first_name": first_name,
                     "last_name": last_name,
                 },
             )
-
-        try:
-            user = User.objects.create_user(
-                username=username,
-                email=email,
-                first_name=first_name,
-                last_name=last_name,
-                password=password,
-            )
-            login(request, user)
-            # Create token for API calls
-            token, created = Token.objects.get_or_create(user=user)
-            request.session["auth_token"] = token.key
-            return redirect("dashboard")
         except Exception as e:
             return render(
                 request,
@@ -183,31 +261,53 @@ def dashboard(request):
     )
 
 
+def _word_timestamps_json(transcription):
+    """Serialized word timestamps, cached until the transcription changes.
+
+    One entry per transcription holds the payload with the ``updated_at`` it
+    was built from, so an edit overwrites it instead of leaving it behind.
+    """
+    key = f"wt:{transcription.pk}"
+    version = transcription.updated_at.timestamp()
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    payload = json.dumps(
+        list(
+            transcription.words.order_by("word_index").values(
+                "word",
+                start=F("start_time"),
+                end=F("end_time"),
+                index=F("word_index"),
+            )
+        )
+    )
+    cache.set(key, (version, payload), WORD_TIMESTAMPS_CACHE_TIMEOUT)
+    return payload
+
+
 @login_required
 def audio_player(request, file_id):
     """Audio player page for a specific file."""
-    from apps.transcription.models import AudioFile, Transcription
-    import json
-
     try:
-        audio_file = AudioFile.objects.get(id=file_id, owner=request.user)
+        # transcription.text is rendered by the player, so it is not deferred;
+        # the owner row is never read (the filter only needs owner_id)
+        audio_file = AudioFile.objects.select_related("transcription").get(
+            id=file_id, owner=request.user
+        )
         transcription = None
-        word_timestamps = []
+        words_url = None
 
         try:
             transcription = audio_file.transcription
-            # Get word-level timestamps for accurate highlighting
+            # Word-level timestamps are loaded separately by the page; the
+            # version matches the wt: cache entry so every edit busts it
             if transcription:
-                words = transcription.words.all().order_by("word_index")
-                word_timestamps = [
-                    {
-                        "word": word.word,
-                        "start": word.start_time,
-                        "end": word.end_time,
-                        "index": word.word_index,
-                    }
-                    for word in words
-                ]
+                words_url = "{}?v={}".format(
+                    reverse("audio_player_words", args=[audio_file.id]),
+                    transcription.updated_at.timestamp(),
+                )
         except Transcription.DoesNotExist:
             pass
 
@@ -217,15 +317,65 @@ def audio_player(request, file_id):
             {
                 "audio_file": audio_file,
                 "transcription": transcription,
-                "word_timestamps_json": json.dumps(word_timestamps),
+                "words_url": words_url,
                 "user": request.user,
             },
         )
     except AudioFile.DoesNotExist:
-        from django.http import Http404
+        raise Http404("Audio file not found")
+
+
+@login_required
+def audio_player_words(request, file_id):
+    """Word timestamps JSON for the audio player.
+
+    The player requests this with a ``v`` query parameter derived from the
+    transcription's ``updated_at``, so the browser may cache it indefinitely.
+    """
+    transcription = (
+        Transcription.objects.only("id", "updated_at")
+        .filter(audio_file_id=file_id, audio_file__owner=request.user)
+        .first()
+    )
+    if transcription is None:
+        raise Http404("Transcription not found")
+
+    response = HttpResponse(
+        _word_timestamps_json(transcription), content_type="application/json"
+    )
+    response["Cache-Control"] = "private, max-age=31536000, immutable"
+    return response
 
+
+@login_required
+def audio_player_audio(request, file_id):
+    """Audio file for the player, served only to its owner.
+
+    With ``MEDIA_ACCEL_REDIRECT_PREFIX`` set, nginx sends the bytes (with range
+    support) from an internal location so no worker is held for the download.
+    """
+    audio_file = (
+        AudioFile.objects.only("file", "original_filename")
+        .filter(id=file_id, owner=request.user)
+        .first()
+    )
+    if audio_file is None:
         raise Http404("Audio file not found")
 
+    content_type = mimetypes.guess_type(audio_file.file.name)[0]
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        response = HttpResponse(content_type=content_type or "application/octet-stream")
+        response["X-Accel-Redirect"] = (
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + audio_file.file.name
+        )
+        return response
+
+    return FileResponse(
+        audio_file.file.open("rb"),
+        content_type=content_type,
+        filename=audio_file.original_filename,
+    )
+
 
 def web_logout(request):
     """Web logout."""
@@ -7,5 +7,15 @@ urlpatterns = [
     path("register/", views.web_register, name="register"),
     path("dashboard/", views.dashboard, name="dashboard"),
     path("audio-player/<int:file_id>/", views.audio_player, name="audio_player"),
+    path(
+        "audio-player/<int:file_id>/words.json",
+        views.audio_player_words,
+        name="audio_player_words",
+    ),
+    path(
+        "audio-player/<int:file_id>/audio/",
+        views.audio_player_audio,
+        name="audio_player_audio",
+    ),
     path("logout/", views.web_logout, name="web_logout"),
 ]
@@ -3,8 +3,12 @@ Utility functions for the application.
 """
 
 import os
-import uuid
-from django.utils.text import slugify
+import secrets
+from django.conf import settings
+
+# Bound once at import; validation runs on every upload
+SUPPORTED_AUDIO_FORMATS = frozenset(settings.SUPPORTED_AUDIO_FORMATS)
+MAX_AUDIO_FILE_SIZE = settings.MAX_AUDIO_FILE_SIZE
 
 
 def get_file_extension(filename):
@@ -13,25 +17,27 @@ def get_file_extension(filename):
 
 
 def generate_unique_filename(filename):
-    """Generate unique filename with UUID prefix."""
-    name, ext = os.path.splitext(filename)
-    return f"{uuid.uuid4().hex}_{slugify(name)}{ext}"
+    """Generate a random storage filename keeping only the extension.
+
+    The user-facing name lives in AudioFile.original_filename.
+    """
+    _, dot, ext = filename.rpartition(".")
+    token = secrets.token_hex(16)
+    return f"{token}.{ext.lower()}" if dot and ext else token
 
 
 def validate_audio_file(file):
     """Validate audio file format and size."""
-    from django.conf import settings
     from .exceptions import UnsupportedAudioFormat, AudioFileTooLarge
 
     # Check file size
-    if file.size > settings.MAX_AUDIO_FILE_SIZE:
-        raise AudioFileTooLarge(
-            f"File size exceeds {settings.MAX_AUDIO_FILE_SIZE} bytes"
-        )
+    if file.size > MAX_AUDIO_FILE_SIZE:
+        raise AudioFileTooLarge(f"File size exceeds {MAX_AUDIO_FILE_SIZE} bytes")
 
     # Check file format
-    ext = get_file_extension(file.name)[1:]  # Remove the dot
-    if ext not in settings.SUPPORTED_AUDIO_FORMATS:
+    _, dot, ext = file.name.rpartition(".")
+    ext = ext.lower() if dot else ""
+    if ext not in SUPPORTED_AUDIO_FORMATS:
         raise UnsupportedAudioFormat(f"Unsupported format: {ext}")
 
     return True
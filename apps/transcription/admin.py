@@ -16,11 +16,14 @@ class AudioFileAdmin(admin.ModelAdmin):
     search_fields = ("original_filename", "owner__email")
     readonly_fields = ("created_at", "updated_at")
     ordering = ("-created_at",)
+    list_select_related = ("owner",)
 
 
 class TranscriptionSegmentInline(admin.TabularInline):
     model = TranscriptionSegment
     extra = 0
+    max_num = 25
+    show_change_link = True
     readonly_fields = ("start_time", "end_time", "text", "confidence_score")
 
 
@@ -38,6 +41,12 @@ class TranscriptionAdmin(admin.ModelAdmin):
     readonly_fields = ("created_at", "updated_at")
     inlines = [TranscriptionSegmentInline]
     ordering = ("-created_at",)
+    # AudioFile.__str__ renders the owner's email
+    list_select_related = ("audio_file", "audio_file__owner")
+
+    def get_queryset(self, request):
+        # The full text is only needed on the change form
+        return super().get_queryset(request).defer("text")
 
 
 @admin.register(TranscriptionSegment)
@@ -46,3 +55,4 @@ class TranscriptionSegmentAdmin(admin.ModelAdmin):
     list_filter = ("transcription__language",)
     search_fields = ("text",)
     ordering = ("transcription", "start_time")
+    list_select_related = ("transcription", "transcription__audio_file")
@@ -9,12 +9,33 @@ class TranscriptionConfig(AppConfig):
     name = "apps.transcription"
     
     def ready(self):
-        """Called when the app is ready. Check speaker detection service health."""
+        """Called when the app is ready. Log configuration and check speaker detection health."""
+        from . import signals  # noqa: F401 - registers cache invalidation receivers
+
+        self.log_service_configuration()
+
         # Only run health check in production/development, not during migrations
         import sys
         if 'migrate' not in sys.argv and 'makemigrations' not in sys.argv:
             self.check_speaker_detection_service()
     
+    def log_service_configuration(self):
+        """Log which external services are configured, once per process."""
+        from django.conf import settings
+
+        if settings.OPENAI_API_KEY:
+            logger.info("✅ OpenAI API key loaded successfully - Transcription service enabled")
+        else:
+            logger.info("ℹ️  OpenAI API key not available - Mock transcription service for testing")
+
+        if settings.SPEAKER_DETECTION_HOST and settings.SPEAKER_DETECTION_PORT:
+            logger.info(
+                f"🔊 Speaker detection service configured at "
+                f"{settings.SPEAKER_DETECTION_HOST}:{settings.SPEAKER_DETECTION_PORT}"
+            )
+        else:
+            logger.info("ℹ️  Speaker detection service not configured - Transcriptions will not include speaker separation")
+    
     def check_speaker_detection_service(self):
         """Check if speaker detection service is available on startup."""
         try:
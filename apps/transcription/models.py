@@ -7,7 +7,7 @@ User = get_user_model()
 
 def audio_upload_path(instance, filename):
     """Generate upload path for audio files."""
-    return f"audio/{instance.owner.id}/{generate_unique_filename(filename)}"
+    return f"audio/{instance.owner_id}/{generate_unique_filename(filename)}"
 
 
 class AudioFile(models.Model):
@@ -15,6 +15,7 @@ class AudioFile(models.Model):
 
     STATUS_CHOICES = [
         ("pending", "Pending"),
+        ("queued", "Queued"),
         ("processing", "Processing"),
         ("completed", "Completed"),
         ("failed", "Failed"),
@@ -28,11 +29,15 @@ class AudioFile(models.Model):
     file_size = models.PositiveIntegerField()
     duration = models.FloatField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    # Latest queued transcription task; scopes the task status endpoint to the owner
+    task_id = models.CharField(max_length=255, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        # Serves the owner-filtered, newest-first list without a sort
+        indexes = [models.Index(fields=["owner", "-created_at", "-id"])]
 
     def __str__(self):
         return f"{self.original_filename} - {self.owner.email}"
@@ -87,6 +92,7 @@ class TranscriptionSegment(models.Model):
 
     class Meta:
         ordering = ["start_time"]
+        indexes = [models.Index(fields=["transcription", "start_time"])]
 
     def __str__(self):
         speaker_info = f" ({self.speaker_label})" if self.speaker_label else ""
@@ -108,6 +114,7 @@ class TranscriptionWord(models.Model):
 
     class Meta:
         ordering = ["word_index"]
+        indexes = [models.Index(fields=["transcription", "word_index"])]
 
     def __str__(self):
         return f"Word '{self.word}' at {self.start_time}s"
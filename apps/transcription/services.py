@@ -2,63 +2,310 @@
 Services for transcription processing.
 """
 
+import hashlib
+import io
 import logging
-import time
-import tempfile
 import os
+import re
+import subprocess
+import time
+import wave
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import attrgetter
+from pathlib import Path
+import httpx
 import numpy as np
-import librosa
+import soundfile
+import soxr
 from openai import OpenAI
+from tinytag import TinyTag
 from django.conf import settings
 from django.core.files.base import ContentFile
-from pydub import AudioSegment
+from django.db import transaction
+from django.utils import timezone
+from pydub.utils import mediainfo
 from .models import AudioFile, Transcription, TranscriptionSegment, TranscriptionWord
+from .signals import invalidate_audio_file_list
 from apps.core.exceptions import TranscriptionError
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT when bulk-creating words and segments
+BULK_CREATE_BATCH_SIZE = 1000
+
+# Sample rate audio is normalized to before upload (good for speech)
+SPEECH_SAMPLE_RATE = 16000
+
+# Frames decoded per block while streaming audio into the resampler
+DECODE_BLOCK_FRAMES = 64 * 1024
+
+# Rate ffmpeg decodes to before soxr resamples to SPEECH_SAMPLE_RATE
+FFMPEG_DECODE_RATE = 48000
+
+# Packing limits for combining short segments into one Whisper upload
+PACK_MAX_BYTES = 24 * 1024 * 1024
+PACK_MAX_SECONDS = 1500
+PACK_GAP_SECONDS = 0.5
+
+# A sentence runs up to terminal punctuation followed by whitespace (so "3.5" stays whole)
+SENTENCE_RE = re.compile(r'\S.*?(?:[.!?]+(?=\s|\Z)|\Z)', re.S)
+
+# Random generator for mock word timings
+_RNG = np.random.default_rng()
+
+# Content types for formats Whisper accepts as-is
+WHISPER_MIME_TYPES = {
+    'mp3': 'audio/mpeg',
+    'mpeg': 'audio/mpeg',
+    'mpga': 'audio/mpeg',
+    'mp4': 'audio/mp4',
+    'm4a': 'audio/mp4',
+    'webm': 'audio/webm',
+    'wav': 'audio/wav',
+    'flac': 'audio/flac',
+    'ogg': 'audio/ogg',
+    'oga': 'audio/ogg',
+}
+
+
+def _ext(filename):
+    """Lowercase extension of a filename, without the dot ('' if there is none)."""
+    return os.path.splitext(filename)[1].lstrip('.').lower()
+
+
+def _mime_for_ext(ext):
+    """Content type to upload a file with the given extension as."""
+    return WHISPER_MIME_TYPES.get(ext.lower(), 'application/octet-stream')
+
+
+def _word_accessors(sample):
+    """
+    Pick word field getters once per response instead of probing every word.
+    
+    Returns:
+        Tuple of (get_word, get_start, get_end, get_confidence) for words
+        shaped like ``sample`` (a dict or an OpenAI word object)
+    """
+    if isinstance(sample, dict):
+        return (
+            lambda w: w.get("word", ""),
+            lambda w: w.get("start", 0.0),
+            lambda w: w.get("end", 0.0),
+            lambda w: w.get("confidence", 1.0),
+        )
+    return (
+        attrgetter("word"),
+        attrgetter("start"),
+        attrgetter("end"),
+        lambda w: getattr(w, "confidence", 1.0),
+    )
+
+
+def _extract_words(transcription_response):
+    """
+    Pull word-level data out of an OpenAI response once, for every consumer.
+    
+    Returns:
+        List of dicts with ``word``, ``start``, ``end`` and ``confidence`` keys
+        (empty if the response has no word data)
+    """
+    try:
+        words_data = None
+        
+        # Try different ways to access word data from OpenAI response
+        if hasattr(transcription_response, "words") and transcription_response.words:
+            words_data = transcription_response.words
+        elif hasattr(transcription_response, "json"):
+            words_data = transcription_response.json().get("words")
+        elif isinstance(transcription_response, dict):
+            words_data = transcription_response.get("words")
+        
+        if not words_data:
+            return []
+        
+        get_word, get_start, get_end, get_confidence = _word_accessors(words_data[0])
+        return [
+            {
+                "word": get_word(word).strip(),
+                "start": float(get_start(word)),
+                "end": float(get_end(word)),
+                "confidence": float(get_confidence(word)),
+            }
+            for word in words_data
+        ]
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Error extracting word data: {str(e)}")
+        return []
+
+
+def _mock_word_timings(word_lengths, has_punct):
+    """
+    Realistic mock word timings as one NumPy pass over the word features.
+    
+    Args:
+        word_lengths: int32 array of word lengths in characters
+        has_punct: bool array, True where a word ends with punctuation
+    
+    Returns:
+        Tuple of (start_times, end_times) float64 arrays in seconds
+    """
+    n_words = len(word_lengths)
+    
+    # More realistic timing based on word characteristics
+    average_words_per_minute = 150  # Typical speaking pace
+    base_duration = 60.0 / average_words_per_minute  # ~0.4 seconds per word
+    
+    # Longer words take more time
+    word_length_factors = np.clip(word_lengths / 5.0, 0.3, 2.0)
+    
+    # Add some natural variation (±20%)
+    variations = _RNG.uniform(0.8, 1.2, size=n_words)
+    
+    # Punctuation causes slight pauses
+    pause_factors = np.where(has_punct, 1.3, 1.0)
+    
+    # Ensure minimum and maximum durations
+    durations = np.clip(
+        base_duration * word_length_factors * variations * pause_factors, 0.2, 1.5
+    )
+    
+    # Small gaps between words; each word starts after the previous one and its gap
+    gaps = _RNG.uniform(0.05, 0.15, size=n_words)
+    start_times = np.concatenate(([0.0], np.cumsum(durations + gaps)[:-1]))
+    return start_times, start_times + durations
+
+
+def _to_speech_pcm(blocks, sample_rate):
+    """
+    Downmix and resample float blocks of shape (frames, channels) to 16kHz mono int16.
+    
+    Blocks are converted one at a time through a streaming resampler, so only
+    the 16kHz output is held in memory, never the full-rate decode.
+    """
+    resampler = None
+    if sample_rate != SPEECH_SAMPLE_RATE:
+        resampler = soxr.ResampleStream(sample_rate, SPEECH_SAMPLE_RATE, 1, quality='HQ')
+    
+    def to_int16(mono):
+        return (np.clip(mono, -1.0, 1.0) * 32767).astype(np.int16)
+    
+    out = []
+    for block in blocks:
+        mono = block.mean(axis=1, dtype=np.float32)
+        if resampler is not None:
+            mono = resampler.resample_chunk(mono)
+        out.append(to_int16(mono))
+    if resampler is not None:
+        out.append(to_int16(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)))
+    return np.concatenate(out) if out else np.zeros(0, dtype=np.int16)
+
+
+def _encode_segment_to_mp3_bytes(pcm_bytes, sample_rate):
+    """
+    Encode mono 16-bit PCM bytes to MP3 by piping them through ffmpeg.
+    
+    The output is buffered rather than handed to the OpenAI client as a pipe:
+    the client retries failed requests by re-sending the body, and httpx sizes
+    file parts with fstat, which reports 0 for a pipe. Encoding still overlaps
+    with other segments' uploads since segments run on worker threads.
+    """
+    result = subprocess.run(
+        [
+            'ffmpeg', '-nostdin', '-loglevel', 'error',
+            '-f', 's16le', '-ar', str(sample_rate), '-ac', '1', '-i', 'pipe:0',
+            '-codec:a', 'libmp3lame', '-b:a', '128k', '-f', 'mp3', 'pipe:1',
+        ],
+        input=pcm_bytes,
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise TranscriptionError(f"MP3 encoding failed: {result.stderr.decode(errors='replace')}")
+    return result.stdout
+
+
+def _pcm_to_wav_bytes(pcm_bytes, sample_rate):
+    """Wrap mono 16-bit PCM bytes in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm_bytes)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=1)
+def _openai_client():
+    """
+    OpenAI client shared by every service instance in the process.
+    Created on first use (after a worker forks); its HTTP/2 pool keeps the TLS
+    connection alive across files and multiplexes concurrent segment uploads.
+    """
+    timeout = getattr(settings, 'OPENAI_CALL_TIMEOUT', 600)
+    return OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        timeout=timeout,
+        http_client=httpx.Client(
+            http2=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        ),
+    )
+
 
 class TranscriptionService:
     """Service for handling audio transcription using OpenAI Whisper."""
 
-    def __init__(self, max_segment_duration: int = 480, max_segment_size: int = 20 * 1024 * 1024):
+    def __init__(self, max_segment_duration: int = 480, max_segment_size: int = 20 * 1024 * 1024,
+                 max_concurrency: int = None):
         """
         Initialize the service.
 
             max_segment_duration: max duration in seconds (default: 480 = 8 minutes)
             max_segment_size: max file size in bytes (default: 20MB)
+            max_concurrency: max concurrent OpenAI API calls (default: OPENAI_MAX_CONCURRENCY setting)
         """
         self.use_mock = not settings.OPENAI_API_KEY
         if not self.use_mock:
-            self.client = OpenAI(
-                api_key=settings.OPENAI_API_KEY,
-                timeout=getattr(settings, 'OPENAI_CALL_TIMEOUT', 600)
-            )
+            self.client = _openai_client()
         self.max_segment_duration = max_segment_duration
         self.max_segment_size = max_segment_size
+        self.max_concurrency = max_concurrency or getattr(settings, 'OPENAI_MAX_CONCURRENCY', 5)
+        self.upload_format = getattr(settings, 'OPENAI_UPLOAD_FORMAT', 'wav')
         
         # Formats that OpenAI Whisper supports natively
-        self.openai_native_formats = ['mp3', 'mp4', 'mpeg', 'mpga', 'm4a', 'webm']
+        self.openai_native_formats = frozenset(WHISPER_MIME_TYPES)
 
-    def transcribe_audio(self, audio_file_id, language="auto"):
+    def transcribe_audio(self, audio_file_id, language="auto", need_words=True,
+                         detect_speakers=True):
         """
         Transcribe an audio file using OpenAI Whisper API or mock service.
+        
+        With ``need_words=False`` only the text is requested from the API and
+        segments are estimated from sentences; no word timestamps are stored.
+        With ``detect_speakers=False`` the caller runs ``process_speaker_detection``
+        itself (e.g. as a separate Celery task).
         """
         start_time = time.time()
 
         try:
-            audio_file = AudioFile.objects.get(id=audio_file_id)
-            audio_file.status = "processing"
-            audio_file.save()
+            audio_file = AudioFile.objects.only(
+                "id", "owner", "file", "original_filename", "file_size", "duration"
+            ).get(id=audio_file_id)
 
             logger.info(f"Starting transcription for audio file {audio_file_id}")
             
-            # Check if audio needs segmentation
+            # Check if audio needs segmentation; the header read is cheap, so the
+            # duration is written together with the status in one UPDATE
             duration = self._get_audio_duration(audio_file)
             if duration:
                 audio_file.duration = duration
-                audio_file.save()
                 logger.info(f"Audio file duration: {duration:.2f}s")
+                self._update_audio_file(audio_file, status="processing", duration=duration)
+            else:
+                self._update_audio_file(audio_file, status="processing")
             
             if self.use_mock:
                 # Use mock transcription for testing
@@ -76,64 +323,13 @@ class TranscriptionService:
 
             else:
                 # Use real OpenAI Whisper API with segmentation for long files
-                segments = self._segment_audio(audio_file)
+                segments = self._pack_segments(self._segment_audio(audio_file))
                 
-                all_transcriptions = []
-                all_words = []
-                detected_language = language
-                
-                for segment_idx, (audio_segment, segment_start_time) in enumerate(segments):
-                    logger.info(f"Transcribing segment {segment_idx + 1}/{len(segments)} (start: {segment_start_time:.2f}s)")
-                    
-                    # Export segment to temporary file for OpenAI API (always as MP3)
-                    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as temp_file:
-                        try:
-                            # Ensure segment is in the right format for OpenAI (MP3, optimized for speech)
-                            optimized_segment = audio_segment.set_frame_rate(16000).set_channels(1)
-                            optimized_segment.export(
-                                temp_file.name, 
-                                format="mp3",
-                                bitrate="128k",
-                                parameters=['-q:a', '2']
-                            )
-                            
-                            with open(temp_file.name, "rb") as segment_file:
-                                segment_response = self.client.audio.transcriptions.create(
-                                    file=(f"{audio_file.original_filename}_segment_{segment_idx + 1}.mp3", segment_file, "audio/mpeg"),
-                                    model="whisper-1",
-                                    response_format="verbose_json",
-                                    timestamp_granularities=["word"],
-                                    language=None if language == "auto" else language,
-                                )
-                            
-                            # Store segment transcription
-                            all_transcriptions.append(segment_response.text)
-                            
-                            # Adjust word timestamps to match the full audio timeline
-                            if hasattr(segment_response, 'words') and segment_response.words:
-                                for word in segment_response.words:
-                                    # Handle OpenAI word objects (they have attributes, not dict keys)
-                                    try:
-                                        adjusted_word = {
-                                            'word': getattr(word, 'word', ''),
-                                            'start': getattr(word, 'start', 0.0) + segment_start_time,
-                                            'end': getattr(word, 'end', 0.0) + segment_start_time,
-                                            'confidence': getattr(word, 'confidence', 1.0)
-                                        }
-                                        all_words.append(adjusted_word)
-                                    except Exception as word_error:
-                                        logger.warning(f"Error processing word in segment {segment_idx}: {str(word_error)}")
-                                        # Skip this word and continue with others
-                                        continue
-                            
-                            # Get language from first segment
-                            if segment_idx == 0:
-                                detected_language = getattr(segment_response, "language", language)
-                                
-                        finally:
-                            # Clean up temporary file
-                            if os.path.exists(temp_file.name):
-                                os.unlink(temp_file.name)
+                all_transcriptions, segment_words, detected_language = self._transcribe_segments(
+                    segments, language, audio_file.original_filename, need_words
+                )
+
+                all_words = [word for words in segment_words for word in words]
                 
                 processing_time = time.time() - start_time
                 transcription_text = " ".join(all_transcriptions)
@@ -146,35 +342,38 @@ class TranscriptionService:
                         self.language = language
                 
                 transcription_response = CombinedResponse(transcription_text, all_words, detected_language)
+                transcription_response.words_normalized = _extract_words(transcription_response)
 
-            # Create transcription record
-            transcription = Transcription.objects.create(
-                audio_file=audio_file,
-                text=transcription_text,
-                language=detected_language,
-                confidence_score=self._calculate_average_confidence(
-                    transcription_response if not self.use_mock else None
-                ),
-                processing_time=processing_time,
-            )
+            # Create transcription record, segments and word timestamps in one commit
+            with transaction.atomic():
+                transcription = Transcription.objects.create(
+                    audio_file=audio_file,
+                    text=transcription_text,
+                    language=detected_language,
+                    confidence_score=self._calculate_average_confidence(
+                        transcription_response if not self.use_mock else None
+                    ),
+                    processing_time=processing_time,
+                )
 
-            # Create segments and word timestamps
-            if self.use_mock:
-                self._create_sentence_segments(transcription)
-                self._create_mock_word_timestamps(transcription)
-            else:
-                self._create_segments_from_words(transcription, transcription_response)
-                self._create_word_timestamps(transcription, transcription_response)
+                if self.use_mock:
+                    self._create_sentence_segments(transcription)
+                    self._create_mock_word_timestamps(transcription)
+                elif not need_words:
+                    self._create_sentence_segments(transcription)
+                else:
+                    self._create_segments_from_words(transcription, transcription_response)
+                    self._create_word_timestamps(transcription, transcription_response)
 
-            audio_file.status = "completed"
-            audio_file.save()
+                self._update_audio_file(audio_file, status="completed")
 
             logger.info(
                 f"Successfully transcribed audio file {audio_file_id} in {processing_time:.2f}s"
             )
             
             # Attempt speaker detection if service is available
-            self._process_speaker_detection(transcription)
+            if detect_speakers:
+                self.process_speaker_detection(transcription)
             
             return transcription
 
@@ -183,47 +382,187 @@ class TranscriptionService:
         except Exception as e:
             logger.error(f"Error transcribing audio file {audio_file_id}: {str(e)}")
             if "audio_file" in locals():
-                audio_file.status = "failed"
-                audio_file.save()
+                self._update_audio_file(audio_file, status="failed")
             raise TranscriptionError(f"Transcription failed: {str(e)}")
 
+    def _transcribe_segments(self, segments, language, original_filename, need_words=True):
+        """
+        Transcribe packed segments concurrently.
+        
+        Segments are independent, so their API calls run concurrently; results
+        are reassembled in segment order to keep the timeline.
+        
+        Returns:
+            Tuple of (texts, words per segment, language of the first segment)
+        """
+        texts = [None] * len(segments)
+        segment_words = [None] * len(segments)
+        detected_language = language
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(segments))))
+        try:
+            futures = [
+                executor.submit(
+                    self._transcribe_one_segment,
+                    segment_idx,
+                    len(segments),
+                    pcm_segment,
+                    pieces,
+                    language,
+                    original_filename,
+                    need_words,
+                )
+                for segment_idx, (pcm_segment, pieces) in enumerate(segments)
+            ]
+            for future in as_completed(futures):
+                segment_idx, text, words, segment_language = future.result()
+                texts[segment_idx] = text
+                segment_words[segment_idx] = words
+                # Get language from first segment
+                if segment_idx == 0:
+                    detected_language = segment_language
+        except BaseException:
+            # One failed segment fails the file: drop queued uploads and report
+            # now instead of waiting out the ones in flight
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        return texts, segment_words, detected_language
+    
+    def _update_audio_file(self, audio_file, **fields):
+        """Write only the given AudioFile columns (and updated_at) in one UPDATE."""
+        AudioFile.objects.filter(pk=audio_file.pk).update(updated_at=timezone.now(), **fields)
+        # Queryset updates send no post_save, so drop the owner's cached list here
+        invalidate_audio_file_list(audio_file.owner_id)
+
+    def _pack_segments(self, segments, max_bytes=PACK_MAX_BYTES, max_seconds=PACK_MAX_SECONDS):
+        """
+        Greedily combine consecutive PCM segments into as few uploads as the API allows.
+        
+        Segment limits are sized from the source file's bitrate, so once decoded to
+        16kHz mono several of them often fit in one request, up to
+        ``max_segment_duration``. Packed segments are separated by a short silence.
+        
+        Returns:
+            List of (payload, pieces) where pieces is a list of
+            (offset_in_payload_seconds, original_start_seconds)
+        """
+        if len(segments) == 1 or isinstance(segments[0][0], bytes):
+            return [(payload, [(0.0, start)]) for payload, start in segments]
+        
+        gap = np.zeros(int(PACK_GAP_SECONDS * SPEECH_SAMPLE_RATE), dtype=np.int16)
+        # Packs never exceed the duration limit every other upload path enforces
+        max_seconds = min(max_seconds, self.max_segment_duration)
+        max_samples = min(max_bytes // 2, int(max_seconds * SPEECH_SAMPLE_RATE))
+        
+        packed = []
+        current, pieces, current_samples = [], [], 0
+        for pcm, start in segments:
+            needed = len(pcm) + (len(gap) if current else 0)
+            if current and current_samples + needed > max_samples:
+                packed.append((np.concatenate(current) if len(current) > 1 else current[0], pieces))
+                current, pieces, current_samples = [], [], 0
+            if current:
+                current.append(gap)
+                current_samples += len(gap)
+            pieces.append((current_samples / SPEECH_SAMPLE_RATE, start))
+            current.append(pcm)
+            current_samples += len(pcm)
+        packed.append((np.concatenate(current) if len(current) > 1 else current[0], pieces))
+        
+        if len(packed) < len(segments):
+            logger.info(f"Packed {len(segments)} segments into {len(packed)} uploads")
+        return packed
+    
+    def _transcribe_one_segment(self, segment_idx, total_segments, pcm_segment,
+                                pieces, language, original_filename, need_words=True):
+        """
+        Transcribe a single audio segment with the OpenAI API.
+
+        ``pcm_segment`` is either a 16kHz mono int16 array or, for files sent
+        unsplit, the original file bytes. ``pieces`` maps offsets within it back
+        to the original timeline (see ``_pack_segments``).
+
+        Returns:
+            Tuple of (segment_idx, text, words, language) where word timestamps
+            are already shifted to the full audio timeline
+        """
+        logger.info(f"Transcribing segment {segment_idx + 1}/{total_segments} (start: {pieces[0][1]:.2f}s)")
+        packed_offsets = [offset for offset, _ in pieces]
+        
+        if isinstance(pcm_segment, bytes):
+            upload = (
+                original_filename,
+                pcm_segment,
+                _mime_for_ext(_ext(original_filename)),
+            )
+        elif self.upload_format == 'mp3':
+            # Segments are transcribed on worker threads, so their ffmpeg
+            # encoders run as parallel processes
+            upload = (
+                f"{original_filename}_segment_{segment_idx + 1}.mp3",
+                _encode_segment_to_mp3_bytes(pcm_segment.tobytes(), SPEECH_SAMPLE_RATE),
+                "audio/mpeg",
+            )
+        else:
+            # Upload the segment as an in-memory WAV: the audio is already 16kHz mono
+            # int16, so no encoder process or temporary file is needed
+            upload = (
+                f"{original_filename}_segment_{segment_idx + 1}.wav",
+                _pcm_to_wav_bytes(pcm_segment.tobytes(), SPEECH_SAMPLE_RATE),
+                "audio/wav",
+            )
+        
+        # Word alignment is only requested when word timestamps will be stored
+        if need_words:
+            response_options = {
+                "response_format": "verbose_json",
+                "timestamp_granularities": ["word"],
+            }
+        else:
+            response_options = {"response_format": "json"}
+        
+        segment_response = self.client.audio.transcriptions.create(
+            file=upload,
+            model="whisper-1",
+            language=None if language == "auto" else language,
+            **response_options,
+        )
+
+        # Adjust word timestamps to match the full audio timeline
+        adjusted_words = []
+        if hasattr(segment_response, 'words') and segment_response.words:
+            for word in segment_response.words:
+                # Handle OpenAI word objects (they have attributes, not dict keys)
+                try:
+                    word_start = getattr(word, 'start', 0.0)
+                    # Route the word to the packed piece it falls in
+                    offset, original_start = pieces[max(0, bisect_right(packed_offsets, word_start) - 1)]
+                    shift = original_start - offset
+                    adjusted_words.append({
+                        'word': getattr(word, 'word', ''),
+                        'start': word_start + shift,
+                        'end': getattr(word, 'end', 0.0) + shift,
+                        'confidence': getattr(word, 'confidence', 1.0)
+                    })
+                except Exception as word_error:
+                    logger.warning(f"Error processing word in segment {segment_idx}: {str(word_error)}")
+                    # Skip this word and continue with others
+                    continue
+
+        segment_language = getattr(segment_response, "language", language)
+        return segment_idx, segment_response.text, adjusted_words, segment_language
+
     def _calculate_average_confidence(self, transcription_response):
         """Calculate average confidence from word-level data if available."""
         if transcription_response is None:
             return 0.95  # Default confidence for mock
 
         try:
-            # Try different ways to access word data from OpenAI response
-            words_data = None
-
-            if (
-                hasattr(transcription_response, "words")
-                and transcription_response.words
-            ):
-                words_data = transcription_response.words
-            elif (
-                hasattr(transcription_response, "json")
-                and "words" in transcription_response.json()
-            ):
-                words_data = transcription_response.json()["words"]
-            elif (
-                isinstance(transcription_response, dict)
-                and "words" in transcription_response
-            ):
-                words_data = transcription_response["words"]
+            words_data = transcription_response.words_normalized
 
             if words_data:
-                confidences = []
-                for word in words_data:
-                    if hasattr(word, "confidence"):
-                        confidences.append(float(word.confidence))
-                    elif isinstance(word, dict) and "confidence" in word:
-                        confidences.append(float(word["confidence"]))
-                    else:
-                        confidences.append(1.0)  # Default if no confidence
-
-                if confidences:
-                    return sum(confidences) / len(confidences)
+                return sum(word["confidence"] for word in words_data) / len(words_data)
 
         except (AttributeError, KeyError, TypeError, ValueError) as e:
             logger.warning(f"Error calculating confidence: {str(e)}")
@@ -233,24 +572,7 @@ class TranscriptionService:
     def _create_segments_from_words(self, transcription, transcription_response):
         """Create segments from word-level timestamps."""
         try:
-            # Try different ways to access word data from OpenAI response
-            words_data = None
-
-            if (
-                hasattr(transcription_response, "words")
-                and transcription_response.words
-            ):
-                words_data = transcription_response.words
-            elif (
-                hasattr(transcription_response, "json")
-                and "words" in transcription_response.json()
-            ):
-                words_data = transcription_response.json()["words"]
-            elif (
-                isinstance(transcription_response, dict)
-                and "words" in transcription_response
-            ):
-                words_data = transcription_response["words"]
+            words_data = transcription_response.words_normalized
 
             if not words_data:
                 # Fallback to sentence-based segments if words not available
@@ -258,45 +580,50 @@ class TranscriptionService:
                 return
 
             segment_duration = 30.0  # Group words into 30-second segments
+            segments = []
             current_segment_words = []
+            current_segment_confidences = []
             segment_start = None
+            last_index = len(words_data) - 1
 
-            for word in words_data:
-                # Handle both dict and object attribute access
-                if hasattr(word, "start"):
-                    word_start = float(word.start)
-                    word_end = float(word.end)
-                    word_text = word.word.strip()
-                else:
-                    word_start = float(word.get("start", 0.0))
-                    word_end = float(word.get("end", 0.0))
-                    word_text = word.get("word", "").strip()
+            for index, word in enumerate(words_data):
+                word_start = word["start"]
+                word_end = word["end"]
+                word_text = word["word"]
+                word_confidence = word["confidence"]
 
                 if segment_start is None:
                     segment_start = word_start
 
                 current_segment_words.append(word_text)
+                current_segment_confidences.append(word_confidence)
 
                 # Create segment if duration exceeded or it's the last word
                 if (word_end - segment_start >= segment_duration) or (
-                    word == words_data[-1]
+                    index == last_index
                 ):
                     segment_text = " ".join(current_segment_words).strip()
                     if segment_text:
-                        TranscriptionSegment.objects.create(
-                            transcription=transcription,
-                            start_time=segment_start,
-                            end_time=word_end,
-                            text=segment_text,
-                            confidence_score=self._calculate_segment_confidence(
-                                current_segment_words, words_data
-                            ),
+                        segments.append(
+                            TranscriptionSegment(
+                                transcription=transcription,
+                                start_time=segment_start,
+                                end_time=word_end,
+                                text=segment_text,
+                                confidence_score=sum(current_segment_confidences)
+                                / len(current_segment_confidences),
+                            )
                         )
 
                     # Reset for next segment
                     current_segment_words = []
+                    current_segment_confidences = []
                     segment_start = None
 
+            TranscriptionSegment.objects.bulk_create(
+                segments, batch_size=BULK_CREATE_BATCH_SIZE
+            )
+
         except Exception as e:
             logger.warning(
                 f"Error creating word-based segments: {str(e)}, falling back to sentence segments"
@@ -306,50 +633,40 @@ class TranscriptionService:
 
     def _create_sentence_segments(self, transcription):
         """Fallback method to create sentence-based segments."""
-        text = transcription.text
-        sentences = text.split(". ")
+        sentences = [match.group(0).rstrip() for match in SENTENCE_RE.finditer(transcription.text)]
+        sentences = [
+            sentence if sentence.endswith(('.', '!', '?')) else sentence + '.'
+            for sentence in sentences
+        ]
         duration_per_char = 0.1  # Rough estimate
-        current_time = 0.0
-
-        for sentence in sentences:
-            if sentence.strip():
-                sentence = sentence.strip() + (
-                    "." if not sentence.endswith(".") else ""
-                )
-                segment_duration = len(sentence) * duration_per_char
+        
+        durations = np.fromiter(
+            (len(sentence) for sentence in sentences), dtype=np.float64, count=len(sentences)
+        ) * duration_per_char
+        end_times = np.cumsum(durations)
+        start_times = end_times - durations
+        confidence = transcription.confidence_score or 0.95
 
-                TranscriptionSegment.objects.create(
+        TranscriptionSegment.objects.bulk_create(
+            [
+                TranscriptionSegment(
                     transcription=transcription,
-                    start_time=current_time,
-                    end_time=current_time + segment_duration,
+                    start_time=start_time,
+                    end_time=end_time,
                     text=sentence,
-                    confidence_score=transcription.confidence_score or 0.95,
+                    confidence_score=confidence,
                 )
-
-                current_time += segment_duration
+                for sentence, start_time, end_time in zip(
+                    sentences, start_times.tolist(), end_times.tolist()
+                )
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+        )
 
     def _create_word_timestamps(self, transcription, transcription_response):
         """Create word-level timestamps from OpenAI response."""
         try:
-            # Check if word-level timestamps are available in the response
-            words_data = None
-
-            # Try different ways to access word data from OpenAI response
-            if (
-                hasattr(transcription_response, "words")
-                and transcription_response.words
-            ):
-                words_data = transcription_response.words
-            elif (
-                hasattr(transcription_response, "json")
-                and "words" in transcription_response.json()
-            ):
-                words_data = transcription_response.json()["words"]
-            elif (
-                isinstance(transcription_response, dict)
-                and "words" in transcription_response
-            ):
-                words_data = transcription_response["words"]
+            words_data = transcription_response.words_normalized
 
             if not words_data:
                 logger.warning(
@@ -362,27 +679,21 @@ class TranscriptionService:
                 f"Creating {len(words_data)} real word timestamps from OpenAI API"
             )
 
-            for index, word_data in enumerate(words_data):
-                # Handle both dict and object attribute access
-                if hasattr(word_data, "word"):
-                    word_text = word_data.word.strip()
-                    start_time = getattr(word_data, "start", 0.0)
-                    end_time = getattr(word_data, "end", 0.0)
-                    confidence = getattr(word_data, "confidence", 1.0)
-                else:
-                    word_text = word_data.get("word", "").strip()
-                    start_time = word_data.get("start", 0.0)
-                    end_time = word_data.get("end", 0.0)
-                    confidence = word_data.get("confidence", 1.0)
-
-                TranscriptionWord.objects.create(
+            words = [
+                TranscriptionWord(
                     transcription=transcription,
-                    word=word_text,
-                    start_time=float(start_time),
-                    end_time=float(end_time),
-                    confidence_score=float(confidence),
+                    word=word_data["word"],
+                    start_time=word_data["start"],
+                    end_time=word_data["end"],
+                    confidence_score=word_data["confidence"],
                     word_index=index,
                 )
+                for index, word_data in enumerate(words_data)
+            ]
+
+            TranscriptionWord.objects.bulk_create(
+                words, batch_size=BULK_CREATE_BATCH_SIZE
+            )
 
         except Exception as e:
             logger.warning(
@@ -394,35 +705,18 @@ class TranscriptionService:
     def _create_mock_word_timestamps(self, transcription):
         """Create realistic mock word timestamps for testing."""
         words = transcription.text.split()
+        n_words = len(words)
 
-        # More realistic timing based on word characteristics
-        current_time = 0.0
-        average_words_per_minute = 150  # Typical speaking pace
-        base_duration = 60.0 / average_words_per_minute  # ~0.4 seconds per word
+        word_lengths = np.fromiter((len(word) for word in words), dtype=np.int32, count=n_words)
+        has_punct = np.fromiter(
+            (word.endswith((",", ".", "!", "?", ";", ":")) for word in words),
+            dtype=np.bool_,
+            count=n_words,
+        )
+        start_times, end_times = _mock_word_timings(word_lengths, has_punct)
 
-        for index, word in enumerate(words):
-            # Adjust duration based on word length and characteristics
-            word_length_factor = max(
-                0.3, min(2.0, len(word) / 5.0)
-            )  # Longer words take more time
-
-            # Add some natural variation
-            import random
-
-            variation = random.uniform(0.8, 1.2)  # ±20% variation
-
-            # Punctuation causes slight pauses
-            pause_factor = 1.3 if word.endswith((",", ".", "!", "?", ";", ":")) else 1.0
-
-            duration = base_duration * word_length_factor * variation * pause_factor
-
-            # Ensure minimum and maximum durations
-            duration = max(0.2, min(1.5, duration))
-
-            start_time = current_time
-            end_time = start_time + duration
-
-            TranscriptionWord.objects.create(
+        word_objects = [
+            TranscriptionWord(
                 transcription=transcription,
                 word=word,
                 start_time=start_time,
@@ -430,59 +724,142 @@ class TranscriptionService:
                 confidence_score=0.95,
                 word_index=index,
             )
+            for index, (word, start_time, end_time) in enumerate(
+                zip(words, start_times.tolist(), end_times.tolist())
+            )
+        ]
 
-            current_time = end_time + random.uniform(
-                0.05, 0.15
-            )  # Small gaps between words
+        TranscriptionWord.objects.bulk_create(
+            word_objects, batch_size=BULK_CREATE_BATCH_SIZE
+        )
 
-    def _calculate_segment_confidence(self, segment_words, all_words):
-        """Calculate confidence for a segment based on its words."""
+    def _get_audio_duration(self, audio_file):
+        """Get audio file duration from the file headers, without decoding."""
         try:
-            word_confidences = []
-            for word_text in segment_words:
-                for word_data in all_words:
-                    # Handle both dict and object attribute access
-                    if hasattr(word_data, "word"):
-                        word_str = word_data.word.strip()
-                        confidence = getattr(word_data, "confidence", 1.0)
-                    else:
-                        word_str = word_data.get("word", "").strip()
-                        confidence = word_data.get("confidence", 1.0)
-
-                    if word_str == word_text.strip():
-                        word_confidences.append(float(confidence))
-                        break
-
-            if word_confidences:
-                return sum(word_confidences) / len(word_confidences)
+            path = audio_file.file.path
+            cache_path = self._pcm_cache_path(audio_file)
+            if cache_path and cache_path.exists():
+                return cache_path.stat().st_size / (2 * SPEECH_SAMPLE_RATE)
+            try:
+                return soundfile.info(path).duration
+            except RuntimeError:
+                pass
+            # Containers libsndfile can't read (m4a, aac...): parse their tags in-process
+            try:
+                duration = TinyTag.get(path).duration
+                if duration:
+                    return duration
+            except Exception as e:
+                logger.debug(f"tinytag could not read {audio_file.original_filename}: {str(e)}")
+            # Anything else (webm...): ask ffprobe
+            return float(mediainfo(path)['duration'])
         except Exception as e:
-            logger.warning(f"Error calculating segment confidence: {str(e)}")
-        return 0.95
+            logger.warning(f"Could not determine audio duration: {str(e)}")
+            return None
     
-    def _get_audio_duration(self, audio_file):
-        """Get audio file duration using pydub."""
+    def _load_with_soundfile(self, audio_file):
+        """
+        Decode audio with libsndfile and resample with soxr.
+        
+        Returns:
+            16kHz mono int16 numpy array, or None if libsndfile can't read the file
+        """
         try:
-            with audio_file.file.open('rb') as file:
-                audio = AudioSegment.from_file(file)
-                return len(audio) / 1000.0  # Convert milliseconds to seconds
+            with soundfile.SoundFile(audio_file.file.path) as source:
+                return _to_speech_pcm(
+                    source.blocks(blocksize=DECODE_BLOCK_FRAMES, dtype='float32', always_2d=True),
+                    source.samplerate,
+                )
         except Exception as e:
-            logger.warning(f"Could not determine audio duration: {str(e)}")
+            logger.debug(f"soundfile could not decode {audio_file.original_filename}: {str(e)}")
             return None
     
+    def _pcm_cache_path(self, audio_file):
+        """Path of the decoded-PCM cache entry for an audio file, or None if caching is off."""
+        cache_dir = getattr(settings, 'PCM_CACHE_DIR', None)
+        if not cache_dir:
+            return None
+        path = audio_file.file.path
+        # Include the mtime so a replaced file never hits a stale entry
+        key = hashlib.sha1(f"{path}:{os.stat(path).st_mtime_ns}".encode()).hexdigest()
+        return Path(cache_dir) / f"{key}.s16le.16k.mono"
+    
+    def _load_pcm(self, audio_file):
+        """
+        Decode audio to 16kHz mono int16, reusing the on-disk PCM cache when possible.
+        
+        Returns:
+            16kHz mono int16 numpy array (memory-mapped on a cache hit)
+        """
+        cache_path = self._pcm_cache_path(audio_file)
+        if cache_path and cache_path.exists():
+            logger.info(f"Using cached PCM for {audio_file.original_filename}")
+            os.utime(cache_path)  # Mark as recently used for eviction
+            return np.memmap(cache_path, dtype=np.int16, mode='r')
+        
+        # libsndfile decode (wav, flac, ogg, mp3...) + soxr resample;
+        # other containers are decoded by ffmpeg
+        pcm = self._load_with_soundfile(audio_file)
+        if pcm is None:
+            pcm = self._load_and_prepare(audio_file)
+        
+        if cache_path and len(pcm):
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                pcm.tofile(temp_path)
+                os.replace(temp_path, cache_path)
+                self._evict_pcm_cache(cache_path.parent)
+            except OSError as e:
+                logger.warning(f"Could not write PCM cache entry: {str(e)}")
+        
+        return pcm
+    
+    def _evict_pcm_cache(self, cache_dir):
+        """Delete least recently used PCM cache entries beyond PCM_CACHE_MAX_BYTES."""
+        max_bytes = getattr(settings, 'PCM_CACHE_MAX_BYTES', 2 * 1024 * 1024 * 1024)
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry)
+            for entry in cache_dir.glob("*.s16le.16k.mono")
+        )
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= max_bytes:
+                break
+            try:
+                entry.unlink()
+                total -= size
+                logger.debug(f"Evicted PCM cache entry: {entry.name}")
+            except OSError as e:
+                logger.warning(f"Failed to evict PCM cache entry {entry.name}: {str(e)}")
+    
     def _segment_audio(self, audio_file):
-        """Segment audio file into chunks based on duration and file size constraints."""
-        converted_temp_file = None
+        """
+        Segment audio file into chunks based on duration and file size constraints.
+        
+        Returns:
+            List of (pcm, start_time_seconds) where pcm is a 16kHz mono int16 array view,
+            or [(file_bytes, 0.0)] when the original file can be uploaded as-is
+        """
         try:
-            # Check if conversion is needed
-            if self._needs_conversion(audio_file):
-                logger.info(f"Non-native format detected, converting to MP3 first")
-                audio, converted_temp_file = self._convert_to_mp3(audio_file)
-            else:
-                # Load audio file directly for native formats
+            # Metadata-only check first: small files in a Whisper format skip decoding entirely
+            duration = audio_file.duration or self._get_audio_duration(audio_file)
+            if (
+                duration
+                and duration <= self.max_segment_duration
+                and audio_file.file_size <= self.max_segment_size
+                and not self._needs_conversion(audio_file)
+            ):
+                logger.info("File within limits, uploading original file as single segment")
                 with audio_file.file.open('rb') as file:
-                    audio = AudioSegment.from_file(file)
+                    return [(file.read(), 0.0)]
+            
+            # The whole file is decoded to 16kHz mono int16 once (or read back from
+            # the PCM cache), and segments are views into it
+            pcm = self._load_pcm(audio_file)
+            sr = SPEECH_SAMPLE_RATE
             
-            duration_ms = len(audio)
+            duration_ms = len(pcm) * 1000 // sr
             duration_seconds = duration_ms / 1000.0
             
             logger.info(f"Audio duration: {duration_seconds:.2f}s, File size: {audio_file.file_size} bytes")
@@ -494,7 +871,9 @@ class TranscriptionService:
             if not needs_duration_split and not needs_size_split:
                 # File is small enough in both duration and size
                 logger.info("File within limits, processing as single segment")
-                return [(audio, 0.0)]
+                return [(pcm, 0.0)]
+            
+            self._compute_rms_envelope(pcm)
             
             # Determine optimal segment duration based on constraints
             optimal_duration = self._calculate_optimal_segment_duration(
@@ -517,10 +896,10 @@ class TranscriptionService:
                     logger.info(f"Last segment, using remaining audio until {actual_end_ms/1000.0:.2f}s")
                 else:
                     # Find optimal split point using silence detection
-                    actual_end_ms = self._find_optimal_split_point(audio, target_end_ms)
+                    actual_end_ms = self._find_optimal_split_point(pcm, target_end_ms)
                 
-                # Create segment
-                segment = audio[start_ms:actual_end_ms]
+                # Create segment as a view over the full sample buffer
+                segment = pcm[int(start_ms * sr // 1000):int(actual_end_ms * sr // 1000)]
                 start_time_seconds = start_ms / 1000.0
                 
                 segments.append((segment, start_time_seconds))
@@ -535,10 +914,15 @@ class TranscriptionService:
         except Exception as e:
             logger.error(f"Error segmenting audio: {str(e)}")
             raise TranscriptionError(f"Audio segmentation failed: {str(e)}")
-        finally:
-            # Clean up temporary converted file if it exists
-            if converted_temp_file:
-                self._cleanup_temp_file(converted_temp_file)
+    
+    def _compute_rms_envelope(self, pcm):
+        """One RMS envelope over 10ms frames for the whole file; split searches index into it."""
+        self._env_hop_samples = max(1, SPEECH_SAMPLE_RATE // 100)
+        n_frames = len(pcm) // self._env_hop_samples
+        frames = pcm[:n_frames * self._env_hop_samples].reshape(-1, self._env_hop_samples)
+        # einsum casts through small buffers, so no full-file squared temporary is allocated
+        sum_squares = np.einsum('ij,ij->i', frames, frames, dtype=np.int64)
+        self._rms_env = np.sqrt(sum_squares / self._env_hop_samples)
     
     def _calculate_optimal_segment_duration(self, total_duration, file_size):
         """Calculate optimal segment duration based on both time and size constraints."""
@@ -559,171 +943,57 @@ class TranscriptionService:
         return optimal_duration
     
     def _needs_conversion(self, audio_file):
-        """Check if audio file needs conversion to MP3."""
-        file_extension = audio_file.original_filename.split('.')[-1].lower()
-        return file_extension not in self.openai_native_formats
+        """Check if audio file is in a format Whisper does not accept as-is."""
+        return _ext(audio_file.original_filename) not in self.openai_native_formats
     
-    def _convert_to_mp3(self, audio_file):
+    def _load_and_prepare(self, audio_file):
         """
-        Convert audio file to MP3 format.
+        Decode audio with ffmpeg and resample with soxr.
         
         Returns:
-            Tuple of (converted_audio_segment, temp_file_path)
+            16kHz mono int16 numpy array
         """
+        logger.info(f"Decoding {audio_file.original_filename} with ffmpeg")
+        path = audio_file.file.path
+        
+        # ffmpeg decodes and downmixes to a fixed rate, so no probe is needed;
+        # the final resample is left to soxr, like the libsndfile path. Output is
+        # read in blocks so the full-rate decode is never buffered. Reading from
+        # the path rather than stdin keeps containers that need seeking (mp4/m4a) working
+        process = subprocess.Popen(
+            [
+                'ffmpeg', '-nostdin', '-loglevel', 'error', '-i', path,
+                '-vn', '-ac', '1', '-ar', str(FFMPEG_DECODE_RATE), '-f', 'f32le', 'pipe:1',
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        
+        def blocks():
+            block_bytes = DECODE_BLOCK_FRAMES * 4
+            while chunk := process.stdout.read(block_bytes):
+                yield np.frombuffer(chunk, dtype=np.float32).reshape(-1, 1)
+        
         try:
-            logger.info(f"Converting {audio_file.original_filename} to MP3 format")
-            
-            # Load audio file with pydub
-            with audio_file.file.open('rb') as file:
-                # Detect format from file extension
-                file_extension = audio_file.original_filename.split('.')[-1].lower()
-                
-                # Load audio with appropriate format and error handling
-                if file_extension in ['ogg', 'oga']:
-                    try:
-                        audio = AudioSegment.from_ogg(file)
-                    except Exception:
-                        # Fallback for OGG files that might contain Opus
-                        audio = AudioSegment.from_file(file)
-                elif file_extension == 'flac':
-                    audio = AudioSegment.from_file(file, format='flac')
-                elif file_extension in ['aac']:
-                    audio = AudioSegment.from_file(file, format='aac')
-                elif file_extension == 'opus':
-                    # Opus files can be in different containers, try multiple approaches
-                    logger.info(f"Processing Opus file: {audio_file.original_filename}")
-                    opus_errors = []
-                    
-                    # Try different approaches in order of likelihood
-                    approaches = [
-                        ("generic format", lambda f: AudioSegment.from_file(f)),
-                        ("explicit opus codec", lambda f: AudioSegment.from_file(f, format='opus')),
-                        ("ogg container", lambda f: AudioSegment.from_file(f, format='ogg')),
-                        ("webm container", lambda f: AudioSegment.from_file(f, format='webm')),
-                        ("raw opus with codec params", lambda f: AudioSegment.from_file(f, codec='libopus')),
-                    ]
-                    
-                    audio = None
-                    for approach_name, approach_func in approaches:
-                        try:
-                            logger.debug(f"Trying Opus file loading with {approach_name}")
-                            audio = approach_func(file)
-                            logger.info(f"Successfully loaded Opus file using {approach_name}")
-                            break
-                        except Exception as e:
-                            error_msg = str(e)
-                            opus_errors.append(f"{approach_name}: {error_msg}")
-                            logger.debug(f"Failed with {approach_name}: {error_msg}")
-                            continue
-                    
-                    if audio is None:
-                        # Last resort: try ffmpeg direct conversion to a temporary WAV file
-                        logger.info("Attempting ffmpeg direct conversion as last resort")
-                        try:
-                            import subprocess
-                            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-                                # Create a temporary input file since we have a file-like object
-                                with tempfile.NamedTemporaryFile(suffix=f'.{file_extension}', delete=False) as temp_input:
-                                    # Copy the file content to a temporary file for ffmpeg
-                                    file.seek(0)
-                                    temp_input.write(file.read())
-                                    temp_input.flush()
-                                    
-                                    # Use ffmpeg to convert directly
-                                    cmd = [
-                                        'ffmpeg', '-i', temp_input.name, 
-                                        '-acodec', 'pcm_s16le',  # Standard WAV codec
-                                        '-ar', '16000',  # 16kHz sample rate
-                                        '-ac', '1',  # Mono
-                                        '-y',  # Overwrite output
-                                        temp_wav.name
-                                    ]
-                                
-                                result = subprocess.run(
-                                    cmd, 
-                                    capture_output=True, 
-                                    text=True, 
-                                    timeout=60
-                                )
-                                
-                                if result.returncode == 0:
-                                    # Load the converted WAV file
-                                    audio = AudioSegment.from_wav(temp_wav.name)
-                                    logger.info("Successfully converted Opus to WAV using direct ffmpeg")
-                                else:
-                                    logger.error(f"FFmpeg conversion failed: {result.stderr}")
-                                    raise Exception(f"FFmpeg error: {result.stderr}")
-                                    
-                        except Exception as ffmpeg_error:
-                            opus_errors.append(f"ffmpeg direct conversion: {str(ffmpeg_error)}")
-                            logger.error(f"FFmpeg fallback also failed: {str(ffmpeg_error)}")
-                        finally:
-                            # Clean up temp files
-                            if 'temp_wav' in locals() and os.path.exists(temp_wav.name):
-                                try:
-                                    os.unlink(temp_wav.name)
-                                except:
-                                    pass
-                            if 'temp_input' in locals() and os.path.exists(temp_input.name):
-                                try:
-                                    os.unlink(temp_input.name)
-                                except:
-                                    pass
-                    
-                    if audio is None:
-                        # All approaches including ffmpeg failed
-                        logger.error(f"All Opus decoding approaches failed for {audio_file.original_filename}")
-                        detailed_errors = "\n".join([f"  • {err}" for err in opus_errors])
-                        raise TranscriptionError(
-                            f"Unable to decode Opus file '{audio_file.original_filename}'. "
-                            f"This may be due to an unsupported Opus container format or corrupted file. "
-                            f"Try converting the file to MP3 format first.\n\nDetailed errors:\n{detailed_errors}"
-                        )
-                elif file_extension == 'wav':
-                    audio = AudioSegment.from_wav(file)
-                else:
-                    # Generic approach for other formats
-                    audio = AudioSegment.from_file(file)
-            
-            # Convert to MP3 format with good quality settings
-            # Set parameters for optimal compatibility with OpenAI
-            converted_audio = audio.set_frame_rate(16000)  # 16kHz sample rate (good for speech)
-            converted_audio = converted_audio.set_channels(1)  # Mono (reduces file size, good for speech)
-            
-            # Create temporary file for converted audio
-            temp_file = tempfile.NamedTemporaryFile(suffix='.mp3', delete=False)
-            temp_file.close()
-            
-            # Export as MP3
-            converted_audio.export(
-                temp_file.name,
-                format='mp3',
-                bitrate='128k',  # Good quality for speech
-                parameters=['-q:a', '2']  # High quality encoding
+            pcm = _to_speech_pcm(blocks(), FFMPEG_DECODE_RATE)
+        finally:
+            process.stdout.close()
+            stderr = process.stderr.read()
+            process.wait()
+        if process.returncode != 0 or not len(pcm):
+            raise TranscriptionError(
+                f"Could not decode audio format. Error: {stderr.decode(errors='replace')}"
             )
-            
-            logger.info(f"Successfully converted to MP3: {temp_file.name}")
-            return converted_audio, temp_file.name
-            
-        except Exception as e:
-            logger.error(f"Error converting audio file to MP3: {str(e)}")
-            raise TranscriptionError(f"Audio conversion failed: {str(e)}")
-    
-    def _cleanup_temp_file(self, temp_file_path):
-        """Clean up temporary file."""
-        try:
-            if temp_file_path and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                logger.debug(f"Cleaned up temporary file: {temp_file_path}")
-        except Exception as e:
-            logger.warning(f"Failed to cleanup temp file {temp_file_path}: {str(e)}")
+        return pcm
     
-    def _find_optimal_split_point(self, audio, target_split_ms, search_window_ms=10000):
+    def _find_optimal_split_point(self, pcm, target_split_ms, search_window_ms=10000):
         """
         Find the optimal split point near the target by detecting silence.
         
+        Reads the RMS envelope precomputed by ``_segment_audio``.
+        
         Args:
-            audio: AudioSegment object
+            pcm: 16kHz mono int16 numpy array
             target_split_ms: Target split point in milliseconds
             search_window_ms: Search window around target (default: 10 seconds)
         
@@ -731,145 +1001,92 @@ class TranscriptionService:
             Optimal split point in milliseconds
         """
         try:
-            # Define search range around target
-            start_search = max(0, target_split_ms - search_window_ms // 2)
-            end_search = min(len(audio), target_split_ms + search_window_ms // 2)
-            
-            # Extract audio segment for analysis
-            search_segment = audio[start_search:end_search]
-            
-            # Convert to numpy array for librosa analysis
-            audio_data = np.array(search_segment.get_array_of_samples())
-            
-            # Handle stereo audio
-            if search_segment.channels == 2:
-                audio_data = audio_data.reshape((-1, 2))
-                audio_data = audio_data.mean(axis=1)  # Convert to mono
-            
-            # Normalize audio data
-            audio_data = audio_data.astype(np.float32)
-            if len(audio_data) > 0:
-                audio_data = audio_data / np.max(np.abs(audio_data))
-            
-            # Use librosa to detect onset frames (speech boundaries)
-            sr = search_segment.frame_rate
-            hop_length = 512
-            
-            # Detect onsets (speech starts)
-            onset_frames = librosa.onset.onset_detect(
-                y=audio_data,
-                sr=sr,
-                hop_length=hop_length,
-                backtrack=True
-            )
+            hop = self._env_hop_samples
+            frames_per_second = SPEECH_SAMPLE_RATE / hop
             
-            # Convert onset frames to time positions
-            onset_times = librosa.frames_to_time(onset_frames, sr=sr, hop_length=hop_length)
-            
-            # Also use RMS energy to find quiet segments
-            rms = librosa.feature.rms(y=audio_data, hop_length=hop_length)[0]
-            rms_times = librosa.frames_to_time(range(len(rms)), sr=sr, hop_length=hop_length)
-            
-            # Find low-energy (quiet) regions
-            rms_threshold = np.percentile(rms, 25)  # Bottom 25% of energy levels
-            quiet_indices = np.where(rms < rms_threshold)[0]
-            quiet_times = rms_times[quiet_indices]
-            
-            # Target time within the search segment (relative to search start)
-            target_time_relative = (target_split_ms - start_search) / 1000.0
-            
-            # Find the best split point by combining onset and quiet regions
-            candidates = []
-            
-            # Add onset points (end of speech segments)
-            for onset_time in onset_times:
-                if 1.0 < onset_time < (end_search - start_search) / 1000.0 - 1.0:  # Avoid edges
-                    distance = abs(onset_time - target_time_relative)
-                    candidates.append((distance, onset_time, 'onset'))
-            
-            # Add quiet regions
-            for quiet_time in quiet_times:
-                if 1.0 < quiet_time < (end_search - start_search) / 1000.0 - 1.0:  # Avoid edges
-                    distance = abs(quiet_time - target_time_relative)
-                    candidates.append((distance, quiet_time, 'quiet'))
-            
-            if candidates:
-                # Sort by distance to target and pick the closest
-                candidates.sort(key=lambda x: x[0])
-                best_candidate = candidates[0]
-                optimal_time_relative = best_candidate[1]
-                candidate_type = best_candidate[2]
-                
-                # Convert back to absolute position in full audio
-                optimal_split_ms = start_search + (optimal_time_relative * 1000)
-                
-                logger.info(f"Found optimal split at {optimal_split_ms:.0f}ms "
-                           f"(target: {target_split_ms:.0f}ms, "
-                           f"offset: {optimal_split_ms - target_split_ms:.0f}ms, "
-                           f"type: {candidate_type})")
-                
-                return int(optimal_split_ms)
-            else:
+            # Search range around target in envelope frames, keeping 1 second off the edges
+            edge_frames = int(frames_per_second)
+            i0 = int((target_split_ms - search_window_ms // 2) * frames_per_second / 1000) + edge_frames
+            i1 = int((target_split_ms + search_window_ms // 2) * frames_per_second / 1000) - edge_frames
+            i0 = max(0, i0)
+            i1 = min(len(self._rms_env), i1)
+            if i1 <= i0:
                 logger.warning(f"No optimal split point found, using target: {target_split_ms}ms")
                 return target_split_ms
+            
+            quietest_frame = i0 + int(np.argmin(self._rms_env[i0:i1]))
+            optimal_split_ms = quietest_frame * hop * 1000 / SPEECH_SAMPLE_RATE
+            
+            logger.info(f"Found optimal split at {optimal_split_ms:.0f}ms "
+                       f"(target: {target_split_ms:.0f}ms, "
+                       f"offset: {optimal_split_ms - target_split_ms:.0f}ms, "
+                       f"type: quiet)")
+            
+            return int(optimal_split_ms)
                 
         except Exception as e:
-            logger.warning(f"Error with librosa analysis: {str(e)}, trying pydub silence detection")
-            return self._find_split_with_pydub(audio, target_split_ms, search_window_ms)
+            logger.warning(f"Error with RMS analysis: {str(e)}, trying silence detection")
+            return self._find_split_with_silence_detection(pcm, target_split_ms, search_window_ms)
     
-    def _find_split_with_pydub(self, audio, target_split_ms, search_window_ms):
-        """Fallback method using pydub's silence detection."""
+    def _find_split_with_silence_detection(self, pcm, target_split_ms, search_window_ms):
+        """Fallback method: the speech end closest to the target, from a 100ms-frame silence mask."""
         try:
-            from pydub.silence import detect_nonsilent
-            
             # Define search range
+            duration_ms = len(pcm) * 1000 // SPEECH_SAMPLE_RATE
             start_search = max(0, target_split_ms - search_window_ms // 2)
-            end_search = min(len(audio), target_split_ms + search_window_ms // 2)
+            end_search = min(duration_ms, target_split_ms + search_window_ms // 2)
             
-            # Extract search segment
-            search_segment = audio[start_search:end_search]
+            window = pcm[int(start_search * SPEECH_SAMPLE_RATE // 1000):int(end_search * SPEECH_SAMPLE_RATE // 1000)]
+            frame_ms = 100  # Minimum 100ms of silence
+            frame_len = SPEECH_SAMPLE_RATE * frame_ms // 1000
+            n_frames = len(window) // frame_len
+            if n_frames == 0:
+                logger.warning("Search window too short for silence detection, using target")
+                return target_split_ms
             
-            # Detect non-silent ranges (speech segments)
-            nonsilent_ranges = detect_nonsilent(
-                search_segment,
-                min_silence_len=100,  # Minimum 100ms of silence
-                silence_thresh=search_segment.dBFS - 20  # 20dB below average
-            )
+            frames = window[:n_frames * frame_len].reshape(-1, frame_len).astype(np.float32)
+            frame_power = np.square(frames).mean(axis=1)
+            
+            # Silent = 20dB below the window's average level: a tenth of its RMS,
+            # compared as mean power (a hundredth) so no sqrt or log10 is needed
+            window_power = frame_power.mean()
+            if window_power == 0:
+                logger.warning("Search window is digital silence, using target")
+                return target_split_ms
+            silent = frame_power < window_power * 0.01
+            
+            # Speech ends where a non-silent frame is followed by a silent one,
+            # and at the window end if the audio is still speech there
+            speech_end_frames = np.flatnonzero(np.diff(silent.astype(np.int8)) == 1) + 1
+            if not silent[-1]:
+                speech_end_frames = np.append(speech_end_frames, n_frames)
             
-            if nonsilent_ranges:
-                # Find speech boundaries (ends of speech segments)
-                speech_ends = [end for start, end in nonsilent_ranges]
+            if len(speech_end_frames) and not silent.all():
+                speech_ends = speech_end_frames * frame_ms
                 
                 # Target position within search segment
                 target_relative = target_split_ms - start_search
                 
-                # Find closest speech end to our target
-                best_split = target_relative
-                min_distance = float('inf')
-                
-                for speech_end in speech_ends:
-                    distance = abs(speech_end - target_relative)
-                    if distance < min_distance:
-                        min_distance = distance
-                        best_split = speech_end
+                # Closest speech end to our target
+                best_split = speech_ends[np.argmin(np.abs(speech_ends - target_relative))]
                 
                 # Convert back to absolute position
                 optimal_split_ms = start_search + best_split
                 
-                logger.info(f"Pydub found split at {optimal_split_ms:.0f}ms "
+                logger.info(f"Silence detection found split at {optimal_split_ms:.0f}ms "
                            f"(target: {target_split_ms:.0f}ms, "
                            f"offset: {optimal_split_ms - target_split_ms:.0f}ms)")
                 
                 return int(optimal_split_ms)
             else:
-                logger.warning("No speech segments detected with pydub, using target")
+                logger.warning("No speech segments detected, using target")
                 return target_split_ms
                 
         except Exception as e:
-            logger.warning(f"Pydub fallback also failed: {str(e)}, using target")
+            logger.warning(f"Silence detection fallback also failed: {str(e)}, using target")
             return target_split_ms
     
-    def _process_speaker_detection(self, transcription):
+    def process_speaker_detection(self, transcription):
         """Process speaker detection for the completed transcription."""
         try:
             from .speaker_detection import speaker_detection_service
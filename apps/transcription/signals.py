@@ -0,0 +1,52 @@
+"""
+Invalidation of the cached per-user audio file list.
+"""
+
+import secrets
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import AudioFile, Transcription
+
+AUDIO_FILE_LIST_CACHE_TIMEOUT = 30  # seconds
+
+
+def _audio_file_list_version_key(owner_id):
+    return f"audiolist:{owner_id}:v"
+
+
+def audio_file_list_cache_key(owner_id, page):
+    """
+    Cache key for one page of a user's audio file list.
+    Keys embed a per-user version, so invalidating is a single write
+    rather than a scan for every cached page.
+    """
+    version = cache.get_or_set(
+        _audio_file_list_version_key(owner_id),
+        lambda: secrets.token_hex(8),
+        timeout=None,
+    )
+    return f"audiolist:{owner_id}:{version}:{page}"
+
+
+def invalidate_audio_file_list(owner_id):
+    """Drop a user's cached audio file list once the current transaction commits."""
+    transaction.on_commit(
+        lambda: cache.set(
+            _audio_file_list_version_key(owner_id), secrets.token_hex(8), timeout=None
+        )
+    )
+
+
+@receiver(post_save, sender=AudioFile)
+@receiver(post_delete, sender=AudioFile)
+def audio_file_changed(sender, instance, **kwargs):
+    invalidate_audio_file_list(instance.owner_id)
+
+
+@receiver(post_save, sender=Transcription)
+def transcription_changed(sender, instance, **kwargs):
+    # Transcriptions (and their segments) are nested in the list payload;
+    # they are only deleted along with their audio file
+    invalidate_audio_file_list(instance.audio_file.owner_id)
@@ -2,13 +2,18 @@
 Speaker detection service integration.
 """
 
+import json
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tempfile
 import os
 from django.conf import settings
+from django.db import transaction
 from typing import Optional, Dict, Any
 from apps.core.exceptions import TranscriptionError
+from .services import BULK_CREATE_BATCH_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +27,17 @@ class SpeakerDetectionService:
         self.enabled = bool(self.host and self.port)
         self.base_url = f"http://{self.host}:{self.port}" if self.enabled else None
         self.timeout = 300  # 5 minutes timeout for speaker detection
+        self.shared_fs = getattr(settings, 'SPEAKER_DETECTION_SHARED_FS', False)
+        
+        # One keep-alive session for all calls; only idempotent requests (the
+        # health check) are retried, since a POST body's file can't be re-read
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount('http://', adapter)
         
     def is_enabled(self) -> bool:
         """Check if speaker detection service is enabled."""
@@ -39,7 +55,7 @@ class SpeakerDetectionService:
             
         try:
             logger.info(f"Checking speaker detection service health at {self.base_url}/healthcheck")
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/healthcheck",
                 timeout=10
             )
@@ -89,33 +105,35 @@ class SpeakerDetectionService:
                 'segments': transcription_data.get('segments', [])
             }
             
-            # Prepare multipart form data
-            files = {}
-            data = {'transcription': payload}
+            if self.shared_fs:
+                # The service reads the file from the shared media volume itself
+                response = self.session.post(
+                    f"{self.base_url}/speaker-detection",
+                    json={'audio_path': audio_file.file.path, 'transcription': payload},
+                    timeout=self.timeout
+                )
+                return self._handle_detection_response(response, audio_file)
             
-            # Add audio file
+            # Multipart form: requests ignores json= when files= is given, so the
+            # transcription goes in a form field next to the audio file
             with audio_file.file.open('rb') as f:
-                files['audio'] = (
-                    audio_file.original_filename,
-                    f.read(),
-                    'audio/mpeg'  # Default MIME type
-                )
+                files = {
+                    'audio': (
+                        audio_file.original_filename,
+                        f,  # File handle, read by requests instead of a separate copy
+                        'audio/mpeg'  # Default MIME type
+                    )
+                }
+                data = {'transcription': json.dumps(payload)}
                 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.base_url}/speaker-detection",
                     files=files,
-                    json=data,
+                    data=data,
                     timeout=self.timeout
                 )
             
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"✅ Speaker detection completed for {audio_file.original_filename}")
-                logger.debug(f"Detected {len(result.get('speakers', []))} speakers")
-                return result
-            else:
-                logger.error(f"Speaker detection API error: HTTP {response.status_code} - {response.text}")
-                return None
+            return self._handle_detection_response(response, audio_file)
                 
         except requests.exceptions.Timeout:
             logger.error(f"Speaker detection request timed out after {self.timeout}s")
@@ -127,6 +145,17 @@ class SpeakerDetectionService:
             logger.error(f"Unexpected error in speaker detection: {str(e)}")
             return None
     
+    def _handle_detection_response(self, response, audio_file) -> Optional[Dict[str, Any]]:
+        """Return the parsed speaker detection result, or None on an API error."""
+        if response.status_code == 200:
+            result = response.json()
+            logger.info(f"✅ Speaker detection completed for {audio_file.original_filename}")
+            logger.debug(f"Detected {len(result.get('speakers', []))} speakers")
+            return result
+        
+        logger.error(f"Speaker detection API error: HTTP {response.status_code} - {response.text}")
+        return None
+    
     def update_transcription_with_speakers(self, transcription, speaker_data: Dict[str, Any]) -> bool:
         """
         Update transcription with speaker-separated data.
@@ -148,43 +177,60 @@ class SpeakerDetectionService:
                 transcription.text = speaker_data['speaker_separated_text']
                 logger.info(f"Updated transcription text with {len(speaker_data['speakers'])} speakers")
             
-            # Update segments with speaker information if available
-            if 'speaker_segments' in speaker_data:
-                from .models import TranscriptionSegment
-                
-                # Clear existing segments
-                TranscriptionSegment.objects.filter(transcription=transcription).delete()
-                
-                # Create new segments with speaker information
-                for segment_data in speaker_data['speaker_segments']:
-                    TranscriptionSegment.objects.create(
-                        transcription=transcription,
-                        start_time=segment_data.get('start_time', 0.0),
-                        end_time=segment_data.get('end_time', 0.0),
-                        text=segment_data.get('text', ''),
-                        confidence_score=segment_data.get('confidence', 0.95),
-                        speaker_id=segment_data.get('speaker_id'),
-                        speaker_label=segment_data.get('speaker_label')
+            # Replace segments, update words and save the text in one commit
+            with transaction.atomic():
+                # Update segments with speaker information if available
+                if 'speaker_segments' in speaker_data:
+                    from .models import TranscriptionSegment
+                    
+                    # Clear existing segments
+                    TranscriptionSegment.objects.filter(transcription=transcription).delete()
+                    
+                    # Create new segments with speaker information
+                    TranscriptionSegment.objects.bulk_create(
+                        [
+                            TranscriptionSegment(
+                                transcription=transcription,
+                                start_time=segment_data.get('start_time', 0.0),
+                                end_time=segment_data.get('end_time', 0.0),
+                                text=segment_data.get('text', ''),
+                                confidence_score=segment_data.get('confidence', 0.95),
+                                speaker_id=segment_data.get('speaker_id'),
+                                speaker_label=segment_data.get('speaker_label')
+                            )
+                            for segment_data in speaker_data['speaker_segments']
+                        ],
+                        batch_size=BULK_CREATE_BATCH_SIZE,
                     )
+                    
+                    logger.info(f"Created {len(speaker_data['speaker_segments'])} speaker-aware segments")
                 
-                logger.info(f"Created {len(speaker_data['speaker_segments'])} speaker-aware segments")
-            
-            # Update word-level data with speaker information if available
-            if 'speaker_words' in speaker_data:
-                from .models import TranscriptionWord
-                
-                # Update existing words with speaker information
-                for word_data in speaker_data['speaker_words']:
-                    word_index = word_data.get('word_index')
-                    speaker_id = word_data.get('speaker_id')
+                # Update word-level data with speaker information if available
+                if 'speaker_words' in speaker_data:
+                    from .models import TranscriptionWord
                     
-                    if word_index is not None and speaker_id is not None:
-                        TranscriptionWord.objects.filter(
-                            transcription=transcription,
-                            word_index=word_index
-                        ).update(speaker_id=speaker_id)
-            
-            transcription.save()
+                    speakers_by_index = {
+                        word_data['word_index']: word_data['speaker_id']
+                        for word_data in speaker_data['speaker_words']
+                        if word_data.get('word_index') is not None
+                        and word_data.get('speaker_id') is not None
+                    }
+                    
+                    # Update existing words with speaker information in batched UPDATEs
+                    words = [
+                        word
+                        for word in TranscriptionWord.objects.filter(
+                            transcription=transcription
+                        ).only('id', 'word_index', 'speaker_id')
+                        if word.word_index in speakers_by_index
+                    ]
+                    for word in words:
+                        word.speaker_id = speakers_by_index[word.word_index]
+                    TranscriptionWord.objects.bulk_update(
+                        words, ['speaker_id'], batch_size=BULK_CREATE_BATCH_SIZE
+                    )
+                
+                transcription.save()
             return True
             
         except Exception as e:
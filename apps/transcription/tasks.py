@@ -1,23 +1,28 @@
 """
 Celery tasks for asynchronous transcription processing.
-Note: This requires Celery to be configured. For now, these are placeholder functions.
 """
 
 import logging
+from celery import chain, shared_task
+from .models import Transcription
 from .services import TranscriptionService
 
 
 logger = logging.getLogger(__name__)
 
 
-def process_transcription(audio_file_id, language="auto"):
+def process_transcription(
+    audio_file_id, language="auto", need_words=True, detect_speakers=True
+):
     """
-    Process transcription asynchronously.
-    This would be a Celery task in a production environment.
+    Process transcription for an audio file.
+    Runs inline; use queue_transcription to run it on workers.
     """
     try:
         service = TranscriptionService()
-        transcription = service.transcribe_audio(audio_file_id, language)
+        transcription = service.transcribe_audio(
+            audio_file_id, language, need_words, detect_speakers
+        )
         logger.info(f"Transcription completed for audio file {audio_file_id}")
         return transcription.id
     except Exception as err:
@@ -27,9 +32,46 @@ def process_transcription(audio_file_id, language="auto"):
         raise
 
 
-# If you want to use Celery, uncomment and configure:
-# from celery import shared_task
-#
-# @shared_task
-# def process_transcription_async(audio_file_id, language='auto'):
-#     return process_transcription(audio_file_id, language)
+@shared_task(bind=True)
+def process_transcription_async(self, audio_file_id, language="auto", need_words=True):
+    """
+    Run process_transcription on a Celery worker.
+    Returns task metadata (stored as the task result).
+    """
+    transcription_id = process_transcription(
+        audio_file_id, language, need_words, detect_speakers=False
+    )
+    return {
+        "task_id": self.request.id,
+        "audio_file_id": audio_file_id,
+        "transcription_id": transcription_id,
+    }
+
+
+@shared_task(bind=True)
+def detect_speakers_async(self, metadata):
+    """
+    Run speaker detection for a finished transcription on the speaker queue.
+    Receives and returns the transcription task's metadata.
+    """
+    transcription = Transcription.objects.select_related("audio_file").get(
+        pk=metadata["transcription_id"]
+    )
+    TranscriptionService().process_speaker_detection(transcription)
+    return {**metadata, "task_id": self.request.id}
+
+
+def queue_transcription(audio_file_id, language="auto", need_words=True, task_id=None):
+    """
+    Queue transcription (OpenAI-bound) followed by speaker detection, each on
+    its own queue so slow API calls and diarization don't hold each other's workers.
+    A task_id may be reserved up front so callers can record it before
+    enqueueing. It names the transcription task only: that task's state is
+    what status polling reports, and its failure stops the chain. Speaker
+    detection runs afterwards as fire-and-forget, so a task reporting SUCCESS
+    may not have speaker labels yet.
+    """
+    transcribe = process_transcription_async.s(audio_file_id, language, need_words)
+    if task_id is not None:
+        transcribe.set(task_id=task_id)
+    return chain(transcribe, detect_speakers_async.s()).apply_async()
@@ -0,0 +1,232 @@
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pytest
+import soundfile
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.accounts.models import User
+from apps.core.exceptions import TranscriptionError
+from config.celery import app as celery_app
+from .models import AudioFile
+from .services import PACK_GAP_SECONDS, SPEECH_SAMPLE_RATE, TranscriptionService
+from .tasks import process_transcription_async
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username="owner",
+        email="owner@example.com",
+        first_name="Audio",
+        last_name="Owner",
+        password="secret-pass-123",
+    )
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def audio_file(user):
+    return AudioFile.objects.create(
+        owner=user,
+        file="audio/1/example.wav",
+        original_filename="example.wav",
+        file_size=1024,
+        status="failed",
+    )
+
+
+@pytest.fixture
+def send_task():
+    """Stub broker: published tasks are captured instead of run inline."""
+    celery_app.conf.CELERY_TASK_ALWAYS_EAGER = False
+    try:
+        with mock.patch.object(celery_app, "send_task") as send_task:
+            yield send_task
+    finally:
+        celery_app.conf.CELERY_TASK_ALWAYS_EAGER = True
+
+
+@pytest.mark.django_db
+def test_task_status_reports_failed_transcription(api_client, audio_file, send_task):
+    response = api_client.post(
+        reverse("retranscribe", kwargs={"audio_file_id": audio_file.id})
+    )
+    assert response.status_code == 202
+
+    # Run the first task of the published chain as a worker would
+    first_task = send_task.call_args_list[0]
+    assert first_task.args[0] == process_transcription_async.name
+    assert first_task.kwargs["task_id"] == response.data["task_id"]
+
+    with mock.patch(
+        "apps.transcription.tasks.TranscriptionService.transcribe_audio",
+        side_effect=TranscriptionError("Transcription failed: boom"),
+    ):
+        process_transcription_async.apply(
+            first_task.args[1], task_id=first_task.kwargs["task_id"]
+        )
+
+    status_response = api_client.get(response.data["status_url"])
+
+    assert status_response.status_code == 200
+    assert status_response.data["state"] == "FAILURE"
+    assert "boom" in status_response.data["error"]
+
+
+@pytest.mark.django_db
+def test_task_status_hidden_from_other_users(api_client, audio_file, send_task):
+    response = api_client.post(
+        reverse("retranscribe", kwargs={"audio_file_id": audio_file.id})
+    )
+    other_user = User.objects.create_user(
+        username="other",
+        email="other@example.com",
+        first_name="Other",
+        last_name="User",
+        password="secret-pass-123",
+    )
+    other_client = APIClient()
+    other_client.force_authenticate(other_user)
+
+    status_response = other_client.get(response.data["status_url"])
+
+    assert status_response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_retranscribe_passes_need_words(api_client, audio_file, send_task):
+    response = api_client.post(
+        reverse("retranscribe", kwargs={"audio_file_id": audio_file.id}),
+        {"need_words": "false"},
+    )
+
+    assert response.status_code == 202
+    assert send_task.call_args_list[0].args[1] == (audio_file.id, "auto", False)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SPEECH_SAMPLE_RATE), dtype=np.int16)
+
+
+def test_pack_segments_offsets_and_duration_limit():
+    service = TranscriptionService(max_segment_duration=10)
+    segments = [(_silence(4), 0.0), (_silence(4), 4.0), (_silence(4), 8.0)]
+
+    packed = service._pack_segments(segments)
+
+    # Two 4s segments plus the gap fit in 10s; a third would not
+    assert [pieces for _, pieces in packed] == [
+        [(0.0, 0.0), (4 + PACK_GAP_SECONDS, 4.0)],
+        [(0.0, 8.0)],
+    ]
+    assert all(
+        len(payload) <= 10 * SPEECH_SAMPLE_RATE for payload, _ in packed
+    )
+    assert len(packed[0][0]) == int((8 + PACK_GAP_SECONDS) * SPEECH_SAMPLE_RATE)
+
+
+def test_packed_words_are_routed_to_their_original_segments():
+    service = TranscriptionService()
+    service.client = mock.Mock()
+    service.client.audio.transcriptions.create.return_value = SimpleNamespace(
+        text="first second",
+        language="en",
+        words=[
+            SimpleNamespace(word="first", start=1.0, end=1.5),
+            SimpleNamespace(word="second", start=5.0, end=5.5),
+        ],
+    )
+    pieces = [(0.0, 0.0), (4 + PACK_GAP_SECONDS, 100.0)]
+
+    _, _, words, _ = service._transcribe_one_segment(
+        0, 1, _silence(9), pieces, "auto", "example.wav"
+    )
+
+    assert [(w["word"], w["start"], w["end"]) for w in words] == [
+        ("first", 1.0, 1.5),
+        ("second", 100.5, 101.0),
+    ]
+
+
+def test_split_point_lands_in_silence_gap():
+    service = TranscriptionService()
+    rng = np.random.default_rng(0)
+    pcm = rng.integers(-3000, 3000, 60 * SPEECH_SAMPLE_RATE).astype(np.int16)
+    pcm[29500 * SPEECH_SAMPLE_RATE // 1000:30500 * SPEECH_SAMPLE_RATE // 1000] = 0
+    service._compute_rms_envelope(pcm)
+
+    split_ms = service._find_optimal_split_point(pcm, 32000)
+
+    assert 29500 <= split_ms < 30500
+
+
+def test_soundfile_decode_streams_to_speech_pcm(tmp_path):
+    # 3s of 48kHz stereo, decoded in several blocks
+    t = np.arange(3 * 48000) / 48000
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+    path = tmp_path / "tone.wav"
+    soundfile.write(path, np.column_stack([tone, tone]), 48000)
+    audio_file = SimpleNamespace(file=SimpleNamespace(path=str(path)), original_filename="tone.wav")
+
+    with mock.patch("apps.transcription.services.DECODE_BLOCK_FRAMES", 10000):
+        pcm = TranscriptionService()._load_with_soundfile(audio_file)
+
+    assert pcm.dtype == np.int16
+    assert abs(len(pcm) - 3 * SPEECH_SAMPLE_RATE) <= 1
+    assert abs(np.abs(pcm).max() - 0.5 * 32767) < 0.02 * 32767
+
+
+def test_ffmpeg_decode_streams_fixed_rate_output():
+    # Stand-in for ffmpeg writing 2s of 48kHz f32le to stdout
+    emit = (
+        "import sys, numpy as np;"
+        "t = np.arange(96000) / 48000;"
+        "sys.stdout.buffer.write((0.5 * np.sin(2 * np.pi * 440 * t)).astype('<f4').tobytes())"
+    )
+    popen = subprocess.Popen
+    audio_file = SimpleNamespace(
+        file=SimpleNamespace(path="/tmp/example.webm"), original_filename="example.webm"
+    )
+
+    with mock.patch(
+        "apps.transcription.services.subprocess.Popen",
+        side_effect=lambda args, **kwargs: popen([sys.executable, "-c", emit], **kwargs),
+    ) as ffmpeg, mock.patch("apps.transcription.services.DECODE_BLOCK_FRAMES", 10000):
+        pcm = TranscriptionService()._load_and_prepare(audio_file)
+
+    args = ffmpeg.call_args.args[0]
+    assert args[args.index("-ar") + 1] == "48000"
+    assert abs(len(pcm) - 2 * SPEECH_SAMPLE_RATE) <= 1
+
+
+def test_failed_segment_does_not_wait_for_other_uploads():
+    started = []
+
+    def transcribe_one(segment_idx, *args):
+        started.append(segment_idx)
+        if segment_idx == 0:
+            raise TranscriptionError("upload failed")
+        time.sleep(1)
+        return segment_idx, "", [], "en"
+
+    service = TranscriptionService(max_concurrency=2)
+    segments = [(_silence(1), [(0.0, float(i))]) for i in range(4)]
+
+    began = time.monotonic()
+    with mock.patch.object(service, "_transcribe_one_segment", side_effect=transcribe_one):
+        with pytest.raises(TranscriptionError):
+            service._transcribe_segments(segments, "auto", "example.wav")
+
+    assert time.monotonic() - began < 0.5
+    assert 3 not in started
@@ -27,5 +27,6 @@ urlpatterns = [
         views.TranscriptionDetailView.as_view(),
         name="transcription_detail",
     ),
+    path("tasks/<str:task_id>/", views.TaskStatusView.as_view(), name="task_status"),
     path("supported-formats/", views.supported_formats, name="supported_formats"),
 ]
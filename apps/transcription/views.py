@@ -1,19 +1,73 @@
-from rest_framework import status, generics
+from rest_framework import serializers, status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.views import APIView
+from celery.result import AsyncResult
+from celery.utils import uuid
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.conf import settings
-from .models import AudioFile, Transcription
+from django.core.cache import cache
+from django.db import transaction
+from .models import AudioFile, Transcription, TranscriptionWord
 from .serializers import (
     AudioFileSerializer,
     AudioFileUploadSerializer,
     TranscriptionSerializer,
 )
-from .tasks import process_transcription
+from .services import BULK_CREATE_BATCH_SIZE
+from .signals import AUDIO_FILE_LIST_CACHE_TIMEOUT, audio_file_list_cache_key
+from .tasks import queue_transcription
 from apps.core.permissions import IsOwner
-from apps.core.exceptions import AudioFileError, TranscriptionError
+from apps.core.exceptions import AudioFileError
+
+
+# Allowance for multipart boundaries, part headers and small form fields
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+# Parses form/JSON booleans ("true", "0", ...) the way serializers do
+_boolean_field = serializers.BooleanField()
+
+
+def _audio_file_last_modified(request, pk):
+    """Newest change to an owned audio file or its nested transcription."""
+    row = (
+        AudioFile.objects.filter(pk=pk, owner=request.user)
+        .values_list("updated_at", "transcription__updated_at")
+        .first()
+    )
+    return max(ts for ts in row if ts is not None) if row else None
+
+
+def _transcription_last_modified(request, pk):
+    """Last change to an owned transcription."""
+    return (
+        Transcription.objects.filter(pk=pk, audio_file__owner=request.user)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+
+
+def _conditional_get(last_modified_func):
+    """
+    Decorators answering unchanged GETs with 304, skipping serialization.
+    no-cache makes browsers revalidate each poll instead of guessing freshness;
+    the ETag carries microseconds since Last-Modified only has seconds.
+    """
+
+    def etag_func(request, pk):
+        last_modified = last_modified_func(request, pk)
+        return last_modified.isoformat() if last_modified else None
+
+    return [
+        cache_control(private=True, no_cache=True),
+        condition(etag_func=etag_func, last_modified_func=last_modified_func),
+    ]
 
 
 class AudioFileListView(generics.ListAPIView):
@@ -23,9 +77,28 @@ class AudioFileListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return AudioFile.objects.filter(owner=self.request.user)
+        # The serializer nests each file's transcription and its segments;
+        # id breaks created_at ties so pages never overlap
+        return (
+            AudioFile.objects.filter(owner=self.request.user)
+            .order_by("-created_at", "-id")
+            .select_related("transcription")
+            .prefetch_related("transcription__segments")
+        )
+
+    def list(self, request, *args, **kwargs):
+        # Clients poll this list; serve repeat polls from cache until a file
+        # or transcription of this user changes (see signals)
+        page = request.query_params.get(self.paginator.page_query_param, 1)
+        data = cache.get_or_set(
+            audio_file_list_cache_key(request.user.pk, page),
+            lambda: super(AudioFileListView, self).list(request, *args, **kwargs).data,
+            timeout=AUDIO_FILE_LIST_CACHE_TIMEOUT,
+        )
+        return Response(data)
 
 
+@method_decorator(_conditional_get(_audio_file_last_modified), name="get")
 class AudioFileDetailView(generics.RetrieveDestroyAPIView):
     """Retrieve or delete a specific audio file."""
 
@@ -33,23 +106,42 @@ class AudioFileDetailView(generics.RetrieveDestroyAPIView):
     permission_classes = [IsAuthenticated, IsOwner]
 
     def get_queryset(self):
-        return AudioFile.objects.filter(owner=self.request.user)
+        # The serializer nests each file's transcription and its segments
+        return (
+            AudioFile.objects.filter(owner=self.request.user)
+            .select_related("transcription")
+            .prefetch_related("transcription__segments")
+        )
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def upload_audio(request):
     """Upload and process an audio file."""
+    # Reject oversize bodies from the declared length, before request.data
+    # parses (and spools to disk) the whole upload
+    content_length = request.META.get("CONTENT_LENGTH")
+    if (
+        content_length
+        and content_length.isdigit()
+        and int(content_length) > settings.MAX_AUDIO_FILE_SIZE + UPLOAD_FORM_OVERHEAD
+    ):
+        return Response(
+            {"error": f"File size exceeds {settings.MAX_AUDIO_FILE_SIZE} bytes"},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
     serializer = AudioFileUploadSerializer(data=request.data)
 
     if serializer.is_valid():
         try:
             # Create audio file record
+            upload = serializer.validated_data["file"]
             audio_file = AudioFile.objects.create(
                 owner=request.user,
-                file=serializer.validated_data["file"],
-                original_filename=serializer.validated_data["file"].name,
-                file_size=serializer.validated_data["file"].size,
+                file=upload,
+                original_filename=upload.name,
+                file_size=upload.size,
                 status="ready",  # Ready for transcription
             )
 
@@ -71,37 +163,95 @@ def upload_audio(request):
 @permission_classes([IsAuthenticated])
 def retranscribe(request, audio_file_id):
     """Retry transcription for a failed audio file."""
-    audio_file = get_object_or_404(AudioFile, id=audio_file_id, owner=request.user)
+    language = request.data.get("language", "auto")
+    # Word timestamps can be skipped when only the text is wanted
+    need_words = _boolean_field.to_internal_value(
+        request.data.get("need_words", True)
+    )
+
+    task_id = uuid()
+
+    # Lock the row so concurrent requests can't both pass the status check;
+    # marking it queued makes repeat submissions fail that check
+    with transaction.atomic():
+        audio_file = get_object_or_404(
+            AudioFile.objects.select_for_update(), id=audio_file_id, owner=request.user
+        )
+
+        if audio_file.status not in ["failed", "ready", "completed"]:
+            return Response(
+                {"error": "Cannot retranscribe file that is currently processing"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        previous_status = audio_file.status
+        audio_file.status = "queued"
+        audio_file.task_id = task_id
+        audio_file.save(update_fields=["status", "task_id", "updated_at"])
 
-    if audio_file.status not in ["failed", "ready", "completed"]:
+    # Enqueue after the atomic block has committed, so the worker never
+    # reads the old row
+    try:
+        queue_transcription(audio_file.id, language, need_words, task_id=task_id)
+    except Exception as e:
+        audio_file.status = previous_status
+        audio_file.save(update_fields=["status", "updated_at"])
         return Response(
-            {"error": "Cannot retranscribe file that is currently processing"},
-            status=status.HTTP_400_BAD_REQUEST,
+            {"error": f"Could not queue transcription: {str(e)}"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
 
-    try:
-        language = request.data.get("language", "auto")
-        # For now, process synchronously. In production, use Celery:
-        # process_transcription_async.delay(audio_file.id, language)
-        process_transcription(audio_file.id, language)
+    return Response(
+        {
+            "task_id": task_id,
+            "audio_file_id": audio_file.id,
+            "status_url": request.build_absolute_uri(
+                reverse("task_status", kwargs={"task_id": task_id})
+            ),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+class TaskStatusView(APIView):
+    """
+    Report the state of a queued transcription task.
+    Only the transcription step is tracked; speaker detection is chained
+    after it fire-and-forget and is not reflected in the state.
+    """
 
-        audio_file.refresh_from_db()
-        serializer = AudioFileSerializer(audio_file)
-        return Response(serializer.data)
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, task_id):
+        # Results carry file ids and metadata, so only the owner may read them
+        if not AudioFile.objects.filter(owner=request.user, task_id=task_id).exists():
+            return Response(
+                {"error": "Task not found"}, status=status.HTTP_404_NOT_FOUND
+            )
 
-    except TranscriptionError as e:
-        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        result = AsyncResult(task_id)
+        data = {"task_id": task_id, "state": result.state}
+        if result.successful():
+            data["result"] = result.result
+        elif result.failed():
+            data["error"] = str(result.result)
+        return Response(data)
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def update_transcription(request, audio_file_id):
     """Update transcription text and word timestamps."""
-    audio_file = get_object_or_404(AudioFile, id=audio_file_id, owner=request.user)
-
-    try:
-        transcription = audio_file.transcription
-    except Transcription.DoesNotExist:
+    # One query through the owner join; the audio file rides along for the
+    # owner id the save signal needs
+    transcription = (
+        Transcription.objects.filter(
+            audio_file_id=audio_file_id, audio_file__owner=request.user
+        )
+        .select_related("audio_file")
+        .first()
+    )
+    if transcription is None:
         return Response(
             {"error": "No transcription found for this file"},
             status=status.HTTP_404_NOT_FOUND,
@@ -116,26 +266,29 @@ def update_transcription(request, audio_file_id):
         )
 
     try:
-        # Update transcription text
-        transcription.text = new_text
-        transcription.save()
-
-        # Update word timestamps
-        from .models import TranscriptionWord
-
         # Delete existing word timestamps
         TranscriptionWord.objects.filter(transcription=transcription).delete()
 
         # Create new word timestamps
-        for word_data in word_timestamps:
-            TranscriptionWord.objects.create(
-                transcription=transcription,
-                word=word_data.get("word", ""),
-                start_time=word_data.get("start", 0.0),
-                end_time=word_data.get("end", 0.0),
-                confidence_score=0.95,  # Default confidence for edited words
-                word_index=word_data.get("index", 0),
-            )
+        TranscriptionWord.objects.bulk_create(
+            [
+                TranscriptionWord(
+                    transcription=transcription,
+                    word=word_data.get("word", ""),
+                    start_time=word_data.get("start", 0.0),
+                    end_time=word_data.get("end", 0.0),
+                    confidence_score=0.95,  # Default confidence for edited words
+                    word_index=word_data.get("index", 0),
+                )
+                for word_data in word_timestamps
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+        )
+
+        # Update transcription text last so updated_at (which keys the cached
+        # word timestamps) only changes once the new words are in place
+        transcription.text = new_text
+        transcription.save()
 
         return Response(
             {
@@ -152,6 +305,7 @@ def update_transcription(request, audio_file_id):
         )
 
 
+@method_decorator(_conditional_get(_transcription_last_modified), name="get")
 class TranscriptionDetailView(generics.RetrieveAPIView):
     """Retrieve transcription details."""
 
@@ -159,30 +313,37 @@ class TranscriptionDetailView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Transcription.objects.filter(audio_file__owner=self.request.user)
+        return Transcription.objects.filter(
+            audio_file__owner=self.request.user
+        ).prefetch_related("segments")
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def transcription_by_audio_file(request, audio_file_id):
     """Get transcription for a specific audio file."""
-    audio_file = get_object_or_404(AudioFile, id=audio_file_id, owner=request.user)
-
-    try:
-        transcription = audio_file.transcription
-        serializer = TranscriptionSerializer(transcription)
-        return Response(serializer.data)
-    except Transcription.DoesNotExist:
+    # One query through the owner join instead of fetching the audio file first
+    transcription = (
+        Transcription.objects.filter(
+            audio_file_id=audio_file_id, audio_file__owner=request.user
+        )
+        .prefetch_related("segments")
+        .first()
+    )
+    if transcription is None:
         return Response(
             {"error": "Transcription not available"}, status=status.HTTP_404_NOT_FOUND
         )
 
+    serializer = TranscriptionSerializer(transcription)
+    return Response(serializer.data)
+
 
 @api_view(["GET"])
 def supported_formats(request):
     """Get supported audio formats and file size limit."""
     return Response({
-        "formats": settings.SUPPORTED_AUDIO_FORMATS,
+        "formats": sorted(settings.SUPPORTED_AUDIO_FORMATS),
         "max_file_size": settings.MAX_AUDIO_FILE_SIZE,
         "max_file_size_mb": settings.MAX_AUDIO_FILE_SIZE // (1024 * 1024),
     })
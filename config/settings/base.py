@@ -2,16 +2,13 @@
 Base settings for ai-scriber project.
 """
 import os
-import logging
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Set up basic logging for startup messages
-logging.basicConfig(level=logging.INFO)
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -60,6 +57,10 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'config.urls'
 
+# Every route and client call uses the canonical trailing-slash form, so
+# CommonMiddleware needn't re-resolve misses looking for a slash redirect
+APPEND_SLASH = False
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -87,9 +88,24 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', ''),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        # Keep connections open across requests instead of connecting per request
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Cache shared by web and worker processes (token lookups, word timestamps,
+# audio file lists); falls back to per-process memory when unset, which is
+# only safe with a single process (required in production)
+REDIS_CACHE_URL = os.environ.get('REDIS_CACHE_URL')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -106,6 +122,13 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing - Argon2id first, PBKDF2 kept so legacy hashes upgrade on login
+PASSWORD_HASHERS = [
+    'apps.accounts.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -121,6 +144,16 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Internal nginx location mapped to MEDIA_ROOT; when set, audio is sent by the
+# proxy (X-Accel-Redirect) after Django checks ownership, otherwise by Django
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+
+# Stream uploads to a temporary file instead of memory; FileSystemStorage then
+# moves the temp file into MEDIA_ROOT (a rename when both are on one filesystem)
+FILE_UPLOAD_MAX_MEMORY_SIZE = 0
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+FILE_UPLOAD_TEMP_DIR = os.environ.get('FILE_UPLOAD_TEMP_DIR') or None  # Existing dir on the media volume
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -130,14 +163,20 @@ AUTH_USER_MODEL = 'accounts.User'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.accounts.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson encodes the nested file/transcription/segment payloads in C
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'drf_orjson_renderer.renderers.ORJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'drf_orjson_renderer.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -145,10 +184,16 @@ REST_FRAMEWORK = {
 
 # Audio file settings
 MAX_AUDIO_FILE_SIZE = 20 * 1024 * 1024  # 20MB - files will be split before processing
-SUPPORTED_AUDIO_FORMATS = ['mp3', 'mp4', 'mpeg', 'mpga', 'm4a', 'wav', 'webm', 'ogg', 'opus', 'aac', 'flac']
+SUPPORTED_AUDIO_FORMATS = frozenset({'mp3', 'mp4', 'mpeg', 'mpga', 'm4a', 'wav', 'webm', 'ogg', 'opus', 'aac', 'flac'})
 
 # Transcription settings
 OPENAI_CALL_TIMEOUT = 600  # 10 minutes timeout for OpenAI API calls
+OPENAI_MAX_CONCURRENCY = int(os.environ.get('OPENAI_MAX_CONCURRENCY', 5))  # Parallel segment uploads
+OPENAI_UPLOAD_FORMAT = os.environ.get('OPENAI_UPLOAD_FORMAT', 'wav')  # 'wav' or 'mp3' (smaller uploads, costs an encode)
+
+# Decoded 16kHz PCM cache so retries don't decode the source file again (empty to disable)
+PCM_CACHE_DIR = os.environ.get('PCM_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'ai-scriber-pcm'))
+PCM_CACHE_MAX_BYTES = int(os.environ.get('PCM_CACHE_MAX_BYTES', 2 * 1024 * 1024 * 1024))
 
 # OpenAI API settings
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
@@ -156,16 +201,29 @@ OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
 # Speaker Detection Service settings
 SPEAKER_DETECTION_HOST = os.environ.get('SPEAKER_DETECTION_HOST', '')
 SPEAKER_DETECTION_PORT = os.environ.get('SPEAKER_DETECTION_PORT', '')
+# Set when the service mounts MEDIA_ROOT at the same path: audio is then sent by path, not uploaded
+SPEAKER_DETECTION_SHARED_FS = os.environ.get('SPEAKER_DETECTION_SHARED_FS', 'False').lower() in ('true', '1', 'yes')
+
+# Celery settings
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+CELERY_TASK_ROUTES = {
+    'apps.accounts.tasks.send_welcome_email': {'queue': 'email_queue'},
+    'apps.transcription.tasks.process_transcription_async': {'queue': 'transcription'},
+    'apps.transcription.tasks.detect_speakers_async': {'queue': 'speaker'},
+}
 
-# Log API key status at startup
-logger = logging.getLogger(__name__)
-if OPENAI_API_KEY:
-    logger.info("✅ OpenAI API key loaded successfully - Transcription service enabled")
-else:
-    logger.info("ℹ️  OpenAI API key not available - Mock transcription service for testing")
-
-# Log speaker detection service configuration
-if SPEAKER_DETECTION_HOST and SPEAKER_DETECTION_PORT:
-    logger.info(f"🔊 Speaker detection service configured at {SPEAKER_DETECTION_HOST}:{SPEAKER_DETECTION_PORT}")
-else:
-    logger.info("ℹ️  Speaker detection service not configured - Transcriptions will not include speaker separation")
\ No newline at end of file
+# Logging - one console handler on the root logger (startup messages included)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': 'INFO',
+    },
+}
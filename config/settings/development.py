@@ -21,6 +21,9 @@ CORS_ALLOW_ALL_ORIGINS = True
 # Email backend for development
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Run Celery tasks inline unless a broker is explicitly configured
+CELERY_TASK_ALWAYS_EAGER = not os.environ.get('CELERY_BROKER_URL')
+
 # Development-specific logging
 LOGGING = {
     'version': 1,
@@ -1,12 +1,25 @@
 """
 Production settings for ai-scriber project.
 """
+from django.core.exceptions import ImproperlyConfigured
 from .base import *
 
 DEBUG = False
 
 ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '').split(',')
 
+# Cache invalidations (revoked tokens, changed file lists) must reach every
+# worker process, which a per-process memory cache can't do
+if not REDIS_CACHE_URL:
+    raise ImproperlyConfigured("REDIS_CACHE_URL must be set in production")
+
+# Serve collected static files from gunicorn with compressed, hashed names
+MIDDLEWARE = MIDDLEWARE[:1] + ['whitenoise.middleware.WhiteNoiseMiddleware'] + MIDDLEWARE[1:]
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
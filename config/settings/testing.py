@@ -13,6 +13,12 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 # Password hashers - use fast hasher for tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
@@ -31,6 +37,11 @@ MIGRATION_MODULES = DisableMigrations()
 # Email backend for testing
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
+# Run Celery tasks inline, keeping their results for the task status endpoint
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_STORE_EAGER_RESULT = True
+CELERY_RESULT_BACKEND = 'cache+memory://'
+
 # Media files for testing
 MEDIA_ROOT = '/tmp/ai-scriber-test-media'
 
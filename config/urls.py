@@ -6,6 +6,12 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+# API endpoints, grouped under a single versioned prefix
+api_v1 = [
+    path('auth/', include('apps.accounts.urls')),
+    path('transcription/', include('apps.transcription.urls')),
+]
+
 urlpatterns = [
     # Web interface (homepage)
     path('', include('apps.accounts.web_urls')),
@@ -14,8 +20,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     
     # API endpoints
-    path('api/v1/auth/', include('apps.accounts.urls')),
-    path('api/v1/transcription/', include('apps.transcription.urls')),
+    path('api/v1/', include(api_v1)),
 ]
 
 if settings.DEBUG: